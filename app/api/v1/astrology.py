@@ -4,7 +4,7 @@ Astrology API Endpoints
 This module provides endpoints for astrology chart generation and retrieval.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from pydantic import BaseModel, validator
 from typing import Optional, Dict, Any
 import logging
@@ -350,7 +350,7 @@ class ChartDataResponse(BaseModel):
 @router.post("/generate-chart", response_model=GenerateChartResponse)
 async def generate_astrology_chart(
     request: GenerateChartRequest,
-    background_tasks: BackgroundTasks,
+    response: Response,
     current_user: str = Depends(get_current_user)
 ):
     """
@@ -359,8 +359,8 @@ async def generate_astrology_chart(
     This endpoint:
     1. Validates the profile belongs to the user
     2. Retrieves birth details from the profile
-    3. Generates complete astrology chart in background
-    4. Returns chart generation status
+    3. Queues complete astrology chart generation as a background job
+    4. Returns 202 with the job id; poll /chart/{profile_id}/status for progress
     """
     try:
         # Validate profile ownership
@@ -426,15 +426,11 @@ async def generate_astrology_chart(
         }
 
         # Generate chart in background
-        background_tasks.add_task(
-            astrology_service.generate_astrology_chart,
-            current_user,
-            request.profile_id,
-            birth_details
-        )
+        await astrology_service.enqueue_chart_generation(current_user, request.profile_id, birth_details)
 
-        logger.info(f"Started astrology chart generation for user {current_user}, profile {request.profile_id}")
+        logger.info(f"Queued astrology chart generation for user {current_user}, profile {request.profile_id}")
 
+        response.status_code = status.HTTP_202_ACCEPTED
         return GenerateChartResponse(
             message="Chart generation started",
             chart_id=chart_id,
@@ -512,7 +508,8 @@ async def get_chart_generation_status(
     """
     Check astrology chart generation status
 
-    This endpoint checks if a chart exists and provides status information
+    This endpoint checks if a chart exists and otherwise reports the state of
+    the background generation job
     """
     try:
         # Validate profile ownership
@@ -535,12 +532,27 @@ async def get_chart_generation_status(
                 "created_at": chart.created_at.isoformat(),
                 "message": "Chart is ready"
             }
-        else:
+
+        job = await astrology_service.get_generation_job(current_user, profile_id)
+        job_status = (job or {}).get('status')
+        if job_status in ("queued", "processing"):
             return {
-                "status": "not_found",
+                "status": job_status,
                 "chart_id": f"{current_user}_{profile_id}",
-                "message": "Chart not found. Please generate the chart first."
+                "message": "Chart generation in progress"
             }
+        if job_status == "failed":
+            return {
+                "status": "failed",
+                "chart_id": f"{current_user}_{profile_id}",
+                "error": job.get('error'),
+                "message": "Chart generation failed. Please try again."
+            }
+        return {
+            "status": "not_found",
+            "chart_id": f"{current_user}_{profile_id}",
+            "message": "Chart not found. Please generate the chart first."
+        }
 
     except HTTPException:
         raise
@@ -572,8 +584,7 @@ async def delete_astrology_chart(
 
         # Delete chart
         chart_id = f"{current_user}_{profile_id}"
-        doc_ref = db.collection('astrology_charts').document(chart_id)
-        doc_ref.delete()
+        await astrology_service.delete_astrology_chart(current_user, profile_id)
 
         logger.info(f"Deleted astrology chart {chart_id}")
 
@@ -602,7 +613,7 @@ async def generate_chart_part_endpoint(
     Generate a single chart part (rasi, navamsa, d10, chandra, shadbala) for the given profile.
     - Validates ownership
     - Auto-resolves latitude/longitude from birth_place if missing
-    - Persists the generated part into astrology_chart_parts
+    - Persists the generated part into astrology_profile.chart_parts
     """
     try:
         db = get_firestore_client()
@@ -667,10 +678,9 @@ async def generate_chart_part_endpoint(
         raise HTTPException(status_code=500, detail=f"Failed to generate {chart_type} chart")
 
 
-@router.post("/profiles/{profile_id}/charts/generate-all")
+@router.post("/profiles/{profile_id}/charts/generate-all", status_code=status.HTTP_202_ACCEPTED)
 async def generate_all_chart_parts_endpoint(
     profile_id: str,
-    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user)
 ):
     """
@@ -724,13 +734,8 @@ async def generate_all_chart_parts_endpoint(
             "birth_datetime": datetime.combine(bd, bt)
         }
 
-        background_tasks.add_task(
-            astrology_service.generate_astrology_chart,
-            current_user,
-            profile_id,
-            birth_details
-        )
-        return {"status": "processing", "message": "Chart generation started"}
+        job_id = await astrology_service.enqueue_chart_generation(current_user, profile_id, birth_details)
+        return {"status": "processing", "job_id": job_id, "message": "Chart generation started"}
     except HTTPException:
         raise
     except Exception as e:
@@ -750,7 +755,7 @@ async def generate_dashboard_extras(
       nakshatra number/name/pada, nakshatra vimsottari lord, retrograde
     - vimsottari: maha-dasas and antar-dasas
 
-    Stored under collection 'astrology_dashboard_extras' with doc id '{user_id}_{profile_id}'.
+    Stored under collection 'astrology_profile' (field 'extras') with doc id '{user_id}_{profile_id}'.
     """
     try:
         # Validate profile ownership
@@ -800,9 +805,10 @@ async def generate_dashboard_extras(
             "birth_datetime": datetime.combine(bd, bt)
         }
 
-        # Fetch upstream data via service
-        planets_extended = await astrology_service.fetch_planets_extended(birth_details)
-        vimsottari = await astrology_service.fetch_vimsottari(birth_details)
+        # Fetch upstream data via service (both endpoints concurrently)
+        extras = await astrology_service.fetch_dashboard_extras(birth_details)
+        planets_extended = extras['planets_extended']
+        vimsottari = extras['vimsottari']
 
         saved = await astrology_service.save_dashboard_extras(
             current_user, profile_id, planets_extended, vimsottari
@@ -900,7 +906,7 @@ async def get_chart_part_endpoint(
     """
     Return a single astrology chart part (rasi, navamsa, d10, chandra, shadbala) for the given profile.
     - Validates ownership (profile belongs to the authenticated user)
-    - Fetches raw chart part persisted in astrology_chart_parts
+    - Fetches raw chart part persisted in astrology_profile.chart_parts
     """
     try:
         # Validate profile ownership
@@ -8,11 +8,14 @@ This module provides API endpoints for:
 - AI-powered predictions
 """
 
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from typing import Dict, List, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Header
 from pydantic import BaseModel, field_validator, model_validator, ValidationError
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
+import json
 import re
 
 from app.core.dependencies import get_current_user
@@ -272,6 +275,31 @@ async def get_profile_predictions(
             detail=f"Failed to get predictions: {str(e)}"
         )
 
+async def _save_prediction(
+    db,
+    profile_id: str,
+    user_id: str,
+    prediction_type: PredictionType,
+    prediction_text: str,
+) -> Prediction:
+    """Build a ChatGPT prediction (daily ones expire after a day) and save it to 'predictions'"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(days=1) if prediction_type == PredictionType.DAILY else None
+
+    prediction = Prediction(
+        id=f"{profile_id}_{prediction_type.value}_{now.strftime('%Y%m%d_%H%M%S')}",
+        profile_id=profile_id,
+        user_id=user_id,
+        prediction_type=prediction_type,
+        prediction_text=prediction_text,
+        generated_by="chatgpt",
+        created_at=now,
+        updated_at=now,
+        expires_at=expires_at
+    )
+    await asyncio.to_thread(db.collection('predictions').document(prediction.id).set, prediction.dict())
+    return prediction
+
 @router.post("/profiles/{profile_id}/predictions/{prediction_type}")
 async def generate_specific_prediction(
     profile_id: str,
@@ -301,33 +329,11 @@ async def generate_specific_prediction(
         )
 
         # Generate specific prediction
-        from app.services.chatgpt_service import chatgpt_service
         prediction_text = await chatgpt_service.generate_personal_predictions(
             profile_data, chart_data, prediction_type.value
         )
 
-        # Calculate expiration
-        expires_at = None
-        if prediction_type == PredictionType.DAILY:
-            from dateutil.relativedelta import relativedelta
-            expires_at = datetime.utcnow() + relativedelta(days=1)
-
-        # Create prediction object
-        prediction = Prediction(
-            id=f"{profile_id}_{prediction_type.value}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            profile_id=profile_id,
-            user_id=current_user,
-            prediction_type=prediction_type,
-            prediction_text=prediction_text,
-            generated_by="chatgpt",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            expires_at=expires_at
-        )
-
-        # Save to database
-        pred_ref = db.collection('predictions').document(prediction.id)
-        pred_ref.set(prediction.dict())
+        prediction = await _save_prediction(db, profile_id, current_user, prediction_type, prediction_text)
 
         return {
             "message": f"{prediction_type.value.title()} prediction generated successfully",
@@ -342,6 +348,64 @@ async def generate_specific_prediction(
             detail=f"Failed to generate prediction: {str(e)}"
         )
 
+@router.post("/profiles/{profile_id}/predictions/{prediction_type}/stream")
+async def stream_specific_prediction(
+    profile_id: str,
+    prediction_type: PredictionType,
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Generate a specific type of prediction and stream it as Server-Sent Events
+
+    Each `data:` event carries a JSON-encoded text fragment; a final `done` event
+    carries the saved prediction id. The prediction is saved once fully received;
+    if generation fails mid-stream an `error` event is sent and nothing is saved.
+    """
+    db = get_firestore_client()
+    profile_doc = await asyncio.to_thread(db.collection('person_profiles').document(profile_id).get)
+    if not profile_doc.exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+
+    profile_data = profile_doc.to_dict()
+    if profile_data.get('user_id') != current_user:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this profile"
+        )
+
+    chart_data = await enhanced_astrology_service._generate_astrology_chart(
+        current_user, profile_id, profile_data
+    )
+
+    async def event_stream():
+        parts = []
+        try:
+            async for delta in chatgpt_service.stream_personal_predictions(
+                profile_data, chart_data, prediction_type.value
+            ):
+                parts.append(delta)
+                yield f"data: {json.dumps(delta)}\n\n"
+        except Exception as e:
+            # Headers are already sent: report the failure in-band and keep the partial text unsaved
+            logger.error(f"Prediction stream failed for profile {profile_id}: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Prediction generation failed'})}\n\n"
+            return
+
+        try:
+            prediction = await _save_prediction(
+                db, profile_id, current_user, prediction_type, "".join(parts).strip()
+            )
+        except Exception as e:
+            logger.error(f"Failed to save streamed prediction for profile {profile_id}: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Failed to save prediction'})}\n\n"
+            return
+        yield f"event: done\ndata: {json.dumps({'id': prediction.id})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 # Marriage Matching Endpoints
 
 # Validation models for marriage matching with strict groom/bride structure
@@ -793,11 +857,10 @@ async def refresh_profile_predictions(
 
         # Generate new predictions
         new_predictions = []
-        for pred_type in prediction_types:
-            prediction_text = await chatgpt_service.generate_personal_predictions(
-                profile_data, chart_data, pred_type.value
-            )
-
+        prediction_texts = await chatgpt_service.generate_personal_predictions_batch(
+            [(profile_data, chart_data, pred_type.value) for pred_type in prediction_types]
+        )
+        for pred_type, prediction_text in zip(prediction_types, prediction_texts):
             # Calculate expiration
             expires_at = None
             if pred_type == PredictionType.DAILY:
@@ -12,13 +12,13 @@ import logging
 import json
 from urllib.parse import urlencode
 import secrets
-import httpx
 
 from app.services.user_service import user_service, AuthStatus
 from app.core.dependencies import get_current_user
 from app.core.exceptions import AuthenticationError, ValidationError
 from app.config.settings import settings
 from app.config.firebase import get_firestore_client
+from app.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -187,40 +187,40 @@ async def google_callback(code: str, state: str, background_tasks: BackgroundTas
     logger.info(f"GOOGLE OAUTH CALLBACK: code_len={len(code) if code else 0}, state={state}")
     logger.info(f"Configured redirect_uri: {settings.redirect_uri}")
     logger.info(f"Configured frontend_url: {settings.frontend_url}")
-    async with httpx.AsyncClient() as client:
-        token_url = "https://oauth2.googleapis.com/token"
-        token_data = {
-            "client_id": settings.google_client_id,
-            "client_secret": settings.google_client_secret,
-            "code": code,
-            "redirect_uri": settings.redirect_uri,
-            "grant_type": "authorization_code",
-        }
-        token_response = await client.post(token_url, data=token_data)
-        if token_response.status_code != 200:
-            logger.error(f"Token exchange failed: {token_response.status_code} {token_response.text}")
-            return {"error": "google_auth_failed", "status": token_response.status_code}
-        token_json = token_response.json()
-        access_token = token_json.get("access_token")
-        userinfo_url = "https://www.googleapis.com/oauth2/v3/userinfo"
-        headers = {"Authorization": f"Bearer {access_token}"}
-        userinfo_response = await client.get(userinfo_url, headers=headers)
-        if userinfo_response.status_code != 200:
-            logger.error(f"Userinfo fetch failed: {userinfo_response.status_code} {userinfo_response.text}")
-            return {"error": "google_user_info_failed", "status": userinfo_response.status_code}
-        user_info = userinfo_response.json()
-        try:
-            result = await user_service.handle_google_user(user_info)
-        except Exception as e:
-            logger.error(f"User processing failed: {e}")
-            return {"error": "google_user_processing_failed", "details": str(e)}
-        background_tasks.add_task(_track_user_login, result['user_id'], result['is_new_user'])
-        return {
-            "access_token": result["access_token"],
-            "user": result["user_data"],
-            "is_new_user": result["is_new_user"],
-            "next_step": result["next_step"],
-        }
+    client = get_http_client()
+    token_url = "https://oauth2.googleapis.com/token"
+    token_data = {
+        "client_id": settings.google_client_id,
+        "client_secret": settings.google_client_secret,
+        "code": code,
+        "redirect_uri": settings.redirect_uri,
+        "grant_type": "authorization_code",
+    }
+    token_response = await client.post(token_url, data=token_data)
+    if token_response.status_code != 200:
+        logger.error(f"Token exchange failed: {token_response.status_code} {token_response.text}")
+        return {"error": "google_auth_failed", "status": token_response.status_code}
+    token_json = token_response.json()
+    access_token = token_json.get("access_token")
+    userinfo_url = "https://www.googleapis.com/oauth2/v3/userinfo"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    userinfo_response = await client.get(userinfo_url, headers=headers)
+    if userinfo_response.status_code != 200:
+        logger.error(f"Userinfo fetch failed: {userinfo_response.status_code} {userinfo_response.text}")
+        return {"error": "google_user_info_failed", "status": userinfo_response.status_code}
+    user_info = userinfo_response.json()
+    try:
+        result = await user_service.handle_google_user(user_info)
+    except Exception as e:
+        logger.error(f"User processing failed: {e}")
+        return {"error": "google_user_processing_failed", "details": str(e)}
+    background_tasks.add_task(_track_user_login, result['user_id'], result['is_new_user'])
+    return {
+        "access_token": result["access_token"],
+        "user": result["user_data"],
+        "is_new_user": result["is_new_user"],
+        "next_step": result["next_step"],
+    }
 
 @router.post("/logout", response_model=LogoutResponse)
 async def logout(request: LogoutRequest, current_user: str = Depends(get_current_user)):
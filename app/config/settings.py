@@ -58,6 +58,10 @@ class Settings(BaseSettings):
     # Astrology API Configuration
     free_astrology_api_key: str = config('FREE_ASTRO_API_KEY', default='')
     astro_api_key: str = config('ASTRO_API_KEY', default='')
+    astro_api_rate_per_second: float = config('ASTRO_API_RATE_PER_SECOND', default=5, cast=float)
+    astro_api_max_retries: int = config('ASTRO_API_MAX_RETRIES', default=3, cast=int)  # Total attempts per upstream request
+    astro_api_max_inflight: int = config('ASTRO_API_MAX_INFLIGHT', default=20, cast=int)
+    astro_max_concurrent_generations: int = config('ASTRO_MAX_CONCURRENT_GENERATIONS', default=4, cast=int)
 
     # OpenAI ChatGPT Configuration
     openai_api_key: str = config('OPENAI_API_KEY', default='')
@@ -69,6 +73,9 @@ class Settings(BaseSettings):
     openai_timeout: int = config('OPENAI_TIMEOUT', default=30, cast=int)
     openai_max_retries: int = config('OPENAI_MAX_RETRIES', default=3, cast=int)
     openai_rate_limit_per_minute: int = config('OPENAI_RATE_LIMIT_PER_MINUTE', default=50, cast=int)
+    openai_cache_ttl: int = config('OPENAI_CACHE_TTL', default=86400, cast=int)  # 0 disables the response cache
+    openai_max_concurrency: int = config('OPENAI_MAX_CONCURRENCY', default=20, cast=int)
+    use_mock_llm: bool = config('USE_MOCK_LLM', default=False, cast=bool)  # Serve canned predictions without calling OpenAI
 
     # Client/Frontend Configuration
     api_base_url: str = config('API_BASE_URL', default='')
@@ -19,6 +19,9 @@ from app.api.v1.unified_auth import router as unified_auth_router
 from app.api.v1.health import router as health_router
 from app.api.v1.astrology import router as astrology_router
 from app.api.v1.enhanced_astrology import router as enhanced_astrology_router
+from app.services.astrology_service import astrology_service
+from app.services.chatgpt_service import chatgpt_service
+from app.utils.http_client import close_http_client
 
 # Configure structured logging
 logging.basicConfig(
@@ -84,6 +87,19 @@ app.include_router(user_management_router, prefix="/api/v1/users", tags=["User M
 app.include_router(astrology_router, prefix="/api/v1/astrology", tags=["Astrology"])
 app.include_router(enhanced_astrology_router, prefix="/api/v1/enhanced", tags=["Enhanced Astrology"])
 
+@app.on_event("startup")
+async def warmup_services():
+    """Warm in-process caches so the first request does not pay cold-start costs"""
+    await astrology_service.warmup()
+    chatgpt_service.start_warmup()
+
+@app.on_event("shutdown")
+async def close_services():
+    """Stop background jobs and release pooled upstream connections"""
+    await astrology_service.aclose()
+    await chatgpt_service.aclose()
+    await close_http_client()
+
 @app.get("/metrics")
 def metrics():
     return Response(generate_latest(), media_type="text/plain")
@@ -6,26 +6,189 @@ and data processing for Vedic astrology features.
 """
 
 import os
-import json
-import time
+import calendar
+import sys
+import mmap
+import random
+import asyncio
+import functools
+import hashlib
 import logging
-from datetime import datetime, date, time
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
-from dateutil.relativedelta import relativedelta
-import requests
 import httpx
+import orjson
+import msgpack
+from cachetools import TTLCache
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
 
 from app.config.settings import settings
 from app.config.firebase import get_firestore_client
-from app.config.settings import settings
 from app.models.astrology import AstrologyChart, PlanetData, HouseData, DashaPeriod
 from app.utils.astrology_utils import calculate_coordinates
+from app.utils.http_client import get_http_client
+from app.utils.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Vimshottari Dasha lords and their period lengths in years, in cycle order
+_DEFAULT_VIMSHOTTARI_ORDER = (
+    ("Ketu", 7),
+    ("Venus", 20),
+    ("Sun", 6),
+    ("Moon", 10),
+    ("Mars", 7),
+    ("Rahu", 18),
+    ("Jupiter", 16),
+    ("Saturn", 19),
+    ("Mercury", 17),
+)
+
+# Each of the 27 nakshatras spans exactly 13°20' of the zodiac
+_NAKSHATRA_SIZE = 40.0 / 3.0
+
+_VALID_CHART_TYPES = frozenset({'rasi', 'navamsa', 'd10', 'chandra', 'shadbala'})
+
+_HOUSE_KEYS = tuple(f"house_{i}" for i in range(1, 13))
+
+# Cache entries above this size are written with O_DIRECT to avoid page-cache flush stalls
+_DIRECT_IO_THRESHOLD = 1024 * 1024
+_DIRECT_IO_ALIGN = 4096
+
+_READ_CACHE_TTL_SECONDS = 60
+_READ_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Decoded upstream chart payloads kept in memory for a day, bounded by approximate JSON bytes
+_RESPONSE_CACHE_TTL_SECONDS = 86400
+_RESPONSE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# A queued/processing job not updated for this long was lost (e.g. worker restart)
+_JOB_STALE_SECONDS = 15 * 60
+
+# Startup pre-warm of the upstream connection gives up quickly; a cold first request is the fallback
+_PREWARM_TIMEOUT_SECONDS = 5.0
+
+
+def _orjson_default(obj):
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
+
+def _payload_size(value) -> int:
+    """Approximate in-memory weight of a cached Firestore document by its JSON size"""
+    return len(orjson.dumps(value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+def _write_cache_bytes(path: str, data: bytes) -> None:
+    """Write a cache entry, bypassing the page cache for large payloads on Linux"""
+    if len(data) > _DIRECT_IO_THRESHOLD and sys.platform.startswith('linux') and hasattr(os, 'O_DIRECT'):
+        try:
+            fd = os.open(path, os.O_DIRECT | os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            fd = None
+        if fd is not None:
+            try:
+                # O_DIRECT needs an aligned buffer and length; anonymous mmap is page-aligned
+                aligned_len = -(-len(data) // _DIRECT_IO_ALIGN) * _DIRECT_IO_ALIGN
+                with mmap.mmap(-1, aligned_len) as buf:
+                    buf.write(data)
+                    view = memoryview(buf)
+                    try:
+                        written = 0
+                        while written < aligned_len:
+                            written += os.write(fd, view[written:])
+                    finally:
+                        view.release()
+                os.ftruncate(fd, len(data))
+                return
+            except OSError:
+                # Filesystems such as tmpfs reject O_DIRECT; use the buffered path
+                pass
+            finally:
+                os.close(fd)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_cache_entry(packed_file: str) -> Optional[Any]:
+    """Load a cached API response from its msgpack entry"""
+    if os.path.exists(packed_file):
+        try:
+            with open(packed_file, "rb") as f:
+                logger.info(f"Loading {packed_file} from cache")
+                return msgpack.unpackb(f.read(), raw=False)
+        except Exception as e:
+            logger.warning(f"Failed to load cache file {packed_file}: {e}")
+    return None
+
+
+def _write_cache_entry(packed_file: str, data: Any) -> None:
+    _write_cache_bytes(packed_file, msgpack.packb(data, use_bin_type=True))
+
+
+def _add_years_months(dt: datetime, years: int, months: int = 0) -> datetime:
+    """Calendar shift equivalent to dt + relativedelta(years=..., months=...), without the object overhead"""
+    total = dt.month - 1 + months
+    year = dt.year + years + total // 12
+    month = total % 12 + 1
+    return dt.replace(year=year, month=month, day=min(dt.day, calendar.monthrange(year, month)[1]))
+
+
+def _nest_field_paths(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand dotted Firestore field paths (e.g. 'chart_parts.rasi') into nested maps for set()"""
+    nested: Dict[str, Any] = {}
+    for path, value in payload.items():
+        *parents, leaf = path.split('.')
+        target = nested
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return nested
+
+
+def _retry_after_seconds(response: httpx.Response, default: float = 0.0) -> float:
+    """Parse a Retry-After header given in seconds; fall back to default"""
+    try:
+        return max(float(response.headers.get("Retry-After", default)), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+# Upstream statuses worth retrying: throttling and transient gateway errors
+_RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+
+def _backoff_delay(attempt: int, base: float = 1.0, floor: float = 0.0) -> float:
+    """
+    Exponential backoff from base seconds, capped at 60s, with +/-20% jitter.
+
+    floor (e.g. a server's Retry-After) is a hard lower bound: jitter never
+    brings the delay below it.
+    """
+    return max(floor, min(base * (2 ** attempt), 60.0) * random.uniform(0.8, 1.2))
+
+
+def _is_stale_job(job: Dict[str, Any], now: datetime) -> bool:
+    """True for a queued/processing job whose last status update is older than _JOB_STALE_SECONDS"""
+    if job.get('status') not in ("queued", "processing"):
+        return False
+    updated_at = job.get('updated_at')
+    if not isinstance(updated_at, datetime):
+        return False
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return (now - updated_at).total_seconds() > _JOB_STALE_SECONDS
+
+
 class AstrologyService:
     """Service for handling astrology calculations and API integrations"""
 
+    # Resolved once per process (see _ensure_vimshottari_order) and shared by all instances
+    _vimshottari_order: Optional[Tuple[Tuple[str, int], ...]] = None
+
     def __init__(self):
         self.free_astro_api_key = settings.free_astrology_api_key
         # FreeAstrology API endpoints (server-to-server upstream)
@@ -40,7 +203,45 @@ class AstrologyService:
             "vimsottari": "https://json.freeastrologyapi.com/vimsottari/maha-dasas-and-antar-dasas"
         }
         self._db = None
-        self._vimshottari_order = None
+        self._api_headers = {"x-api-key": self.free_astro_api_key}
+        # Shared across requests so concurrent chart fetches stay under the provider quota
+        self._rate_limiter = AsyncTokenBucket(settings.astro_api_rate_per_second)
+        self._inflight: Optional[asyncio.Semaphore] = None
+        # Background chart generation jobs keyed by chart id, bounded by a worker slot semaphore
+        self._generation_jobs: Dict[str, asyncio.Task] = {}
+        # Live status ("queued" / "processing") of the jobs running in this process
+        self._job_states: Dict[str, str] = {}
+        self._generation_slots: Optional[asyncio.Semaphore] = None
+        # Create the on-disk API cache directory once instead of on every fetch
+        self._cache_dir = "cache/astrology"
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to create cache directory {self._cache_dir}: {e}")
+        # Short-lived read-through cache of astrology_profile documents,
+        # bounded by approximate payload bytes and invalidated on every write
+        self._profile_cache = TTLCache(maxsize=_READ_CACHE_MAX_BYTES, ttl=_READ_CACHE_TTL_SECONDS, getsizeof=_payload_size)
+        self._profile_reads: Dict[str, asyncio.Future] = {}
+        # Bumped on every profile write; reads that overlapped one do not populate the cache
+        self._profile_write_epoch = 0
+        # Decoded upstream responses keyed by cache path, in front of the on-disk cache.
+        # Entries are shared between callers and must be treated as read-only.
+        self._response_cache = TTLCache(
+            maxsize=_RESPONSE_CACHE_MAX_BYTES, ttl=_RESPONSE_CACHE_TTL_SECONDS, getsizeof=_payload_size
+        )
+        self._pending_fetches: Dict[str, asyncio.Future] = {}
+        # Recently read or saved charts; concurrent misses share one Firestore read
+        self._chart_cache = TTLCache(maxsize=1024, ttl=_READ_CACHE_TTL_SECONDS)
+        self._chart_reads: Dict[str, asyncio.Future] = {}
+        # Bumped on every chart write/delete; reads that overlapped one do not populate the cache
+        self._chart_write_epoch = 0
+        # Content hashes of the last fields written per document, used to skip no-op writes
+        self._content_hashes = TTLCache(maxsize=4096, ttl=600)
+        # Per-instance memoization of document references for hot (user, profile) pairs
+        self._profile_ref = functools.lru_cache(maxsize=1024)(self._profile_ref)
+        self._chart_parts_ref = functools.lru_cache(maxsize=1024)(self._chart_parts_ref)
+        self._extras_ref = functools.lru_cache(maxsize=1024)(self._extras_ref)
+        self._normalize_birth_details_cached = functools.lru_cache(maxsize=256)(self._normalize_birth_details_cached)
 
     @property
     def db(self):
@@ -49,16 +250,72 @@ class AstrologyService:
             self._db = get_firestore_client()
         return self._db
 
+    def _profile_ref(self, doc_id: str):
+        return self.db.collection('astrology_profile').document(doc_id)
+
+    # Legacy per-feature collections, read only as a fallback for documents
+    # written before chart parts and dashboard extras moved into astrology_profile
+    def _chart_parts_ref(self, doc_id: str):
+        return self.db.collection('astrology_chart_parts').document(doc_id)
+
+    def _extras_ref(self, doc_id: str):
+        return self.db.collection('astrology_dashboard_extras').document(doc_id)
+
     @property
     def vimshottari_order(self):
         """Get Vimshottari Dasha order from database"""
-        if self._vimshottari_order is None:
-            self._vimshottari_order = self._get_or_init_vimshottari_order()
-        return self._vimshottari_order
+        cls = type(self)
+        if cls._vimshottari_order is None:
+            cls._vimshottari_order = tuple(tuple(p) for p in self._get_or_init_vimshottari_order())
+        return cls._vimshottari_order
+
+    async def _ensure_vimshottari_order(self) -> None:
+        """Resolve the Vimshottari order (a sync Firestore read on first access) off the event loop"""
+        if type(self)._vimshottari_order is None:
+            await asyncio.to_thread(lambda: self.vimshottari_order)
+
+    async def warmup(self) -> None:
+        """
+        Pre-load in-process state at application startup so the first user
+        request does not pay the cold-start cost.
+
+        Resolves the Vimshottari order (a Firestore round trip on first access)
+        off the event loop, runs the Dasha calculation once and opens the shared
+        HTTP client's connection (DNS, TCP, TLS) to the astrology API host.
+        """
+        try:
+            await self._ensure_vimshottari_order()
+            self._compute_vimshottari_dasha(datetime.utcnow(), 0.0)
+            logger.info("Astrology service warmup complete")
+        except Exception as e:
+            logger.warning(f"Astrology service warmup failed: {e}")
+        await self._prewarm_upstream_connection()
+
+    async def _prewarm_upstream_connection(self) -> None:
+        """Send a cheap HEAD to the API host so the pooled connection is ready for the first chart fetch"""
+        origin = httpx.URL(self.api_endpoints["rasi"]).copy_with(path="/")
+        try:
+            await get_http_client().head(origin, timeout=_PREWARM_TIMEOUT_SECONDS)
+            logger.info(f"Pre-warmed upstream connection to {origin.host}")
+        except Exception as e:
+            # Any status is fine (the connection is what matters); network errors only cost the first request
+            logger.warning(f"Upstream connection pre-warm failed: {e}")
 
     def _normalize_birth_details(self, details: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize and sanitize birth details for external API payloads (JSON-serializable only)"""
         d = details or {}
+        # Fetchers on the same request share identical details; memoize on their frozen items
+        try:
+            key = tuple(sorted(d.items()))
+            hash(key)
+        except TypeError:
+            return self._build_normalized_birth_details(d)
+        return dict(self._normalize_birth_details_cached(key))
+
+    def _normalize_birth_details_cached(self, items: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+        return self._build_normalized_birth_details(dict(items))
+
+    def _build_normalized_birth_details(self, d: Dict[str, Any]) -> Dict[str, Any]:
 
         # Extract date components
         year = d.get("year")
@@ -161,10 +418,8 @@ class AstrologyService:
             # Fetch all chart data
             chart_data = await self._fetch_all_charts(birth_details)
 
-            # Persist raw chart parts for per-tab retrieval
-            await self._save_chart_parts_to_db(user_id, profile_id, chart_data)
-            
             # Calculate Vimshottari Dasha
+            await self._ensure_vimshottari_order()
             moon_longitude = self._extract_moon_longitude(chart_data.get("rasi", {}))
             birth_dt = birth_details.get("birth_datetime")
             if not isinstance(birth_dt, datetime):
@@ -206,8 +461,8 @@ class AstrologyService:
                 is_active=True
             )
 
-            # Save to database
-            await self._save_chart_to_db(chart)
+            # Save chart and raw chart parts (for per-tab retrieval) in one batch
+            await self._save_chart_to_db(chart, chart_data)
 
             logger.info(f"Successfully generated and saved astrology chart for user {user_id}")
             return chart
@@ -227,19 +482,223 @@ class AstrologyService:
         Returns:
             AstrologyChart or None if not found
         """
+        doc_id = f"{user_id}_{profile_id}"
+        chart = self._chart_cache.get(doc_id)
+        if chart is not None:
+            return chart
         try:
-            doc_ref = self.db.collection('astrology_charts').document(f"{user_id}_{profile_id}")
-            doc = doc_ref.get()
+            pending = self._chart_reads.get(doc_id)
+            if pending is None:
+                pending = asyncio.ensure_future(self._load_astrology_chart(doc_id))
+                self._chart_reads[doc_id] = pending
 
-            if doc.exists:
-                data = doc.to_dict()
-                return AstrologyChart(**data)
-            return None
+                def _discard(f: asyncio.Future, key: str = doc_id) -> None:
+                    if self._chart_reads.get(key) is f:
+                        del self._chart_reads[key]
+
+                pending.add_done_callback(_discard)
+            return await asyncio.shield(pending)
 
         except Exception as e:
             logger.error(f"Failed to retrieve astrology chart for user {user_id}: {e}")
             return None
 
+    async def get_astrology_charts(self, pairs: List[Tuple[str, str]]) -> Dict[str, AstrologyChart]:
+        """
+        Retrieve several astrology charts with a single Firestore round trip
+
+        Args:
+            pairs: (user_id, profile_id) tuples
+
+        Returns:
+            Dict of chart id ("{user_id}_{profile_id}") to AstrologyChart; missing charts are omitted
+        """
+        charts: Dict[str, AstrologyChart] = {}
+        missing = []
+        for user_id, profile_id in pairs:
+            doc_id = f"{user_id}_{profile_id}"
+            chart = self._chart_cache.get(doc_id)
+            if chart is not None:
+                charts[doc_id] = chart
+            elif doc_id not in missing:
+                missing.append(doc_id)
+        if not missing:
+            return charts
+
+        try:
+            collection = self.db.collection('astrology_charts')
+            refs = [collection.document(doc_id) for doc_id in missing]
+            epoch = self._chart_write_epoch
+            docs = await asyncio.to_thread(lambda: list(self.db.get_all(refs)))
+            for doc in docs:
+                if doc.exists:
+                    chart = AstrologyChart(**doc.to_dict())
+                    if epoch == self._chart_write_epoch:
+                        self._chart_cache[doc.id] = chart
+                    charts[doc.id] = chart
+        except Exception as e:
+            logger.error(f"Failed to retrieve astrology charts {missing}: {e}")
+        return charts
+
+    async def _load_astrology_chart(self, doc_id: str) -> Optional[AstrologyChart]:
+        epoch = self._chart_write_epoch
+        doc = await asyncio.to_thread(self.db.collection('astrology_charts').document(doc_id).get)
+        if not doc.exists:
+            return None
+        chart = AstrologyChart(**doc.to_dict())
+        # A write that landed while this read was in flight may have made it stale
+        if epoch == self._chart_write_epoch:
+            self._chart_cache[doc_id] = chart
+        return chart
+
+    def _invalidate_chart(self, doc_id: str) -> None:
+        """Drop a chart from the read cache and detach in-flight reads so they cannot re-cache it"""
+        self._chart_write_epoch += 1
+        self._chart_cache.pop(doc_id, None)
+        self._chart_reads.pop(doc_id, None)
+
+    async def delete_astrology_chart(self, user_id: str, profile_id: str) -> None:
+        """Delete the stored chart for a profile and drop it from the read cache"""
+        doc_id = f"{user_id}_{profile_id}"
+        self._invalidate_chart(doc_id)
+        try:
+            await asyncio.to_thread(self.db.collection('astrology_charts').document(doc_id).delete)
+        finally:
+            self._invalidate_chart(doc_id)
+
+    def _cache_file(self, chart_type: str, details: Dict[str, Any]) -> str:
+        """
+        Build the on-disk cache path for a chart type and birth details.
+
+        Keyed by a hash of the full normalized API payload (date, time, location,
+        timezone) so different births on the same day never share an entry.
+        """
+        key = hashlib.blake2b(
+            orjson.dumps(self._normalize_birth_details(details), option=orjson.OPT_SORT_KEYS),
+            digest_size=16,
+        ).hexdigest()
+        return f"{self._cache_dir}/{chart_type}_{key}.msgpack"
+
+    def _get_inflight(self) -> asyncio.Semaphore:
+        """Process-wide cap on concurrent upstream requests, created inside the running loop"""
+        if self._inflight is None:
+            self._inflight = asyncio.Semaphore(max(settings.astro_api_max_inflight, 1))
+        return self._inflight
+
+    async def aclose(self) -> None:
+        """Cancel queued generation jobs (called on application shutdown)"""
+        tasks = list(self._generation_jobs.values())
+        for task in tasks:
+            task.cancel()
+        # Let each job record its "failed" status before the loop goes away
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_generation_slots(self) -> asyncio.Semaphore:
+        """Cap on chart generations running at once, created inside the running loop"""
+        if self._generation_slots is None:
+            self._generation_slots = asyncio.Semaphore(max(settings.astro_max_concurrent_generations, 1))
+        return self._generation_slots
+
+    async def _set_job_status(self, job_id: str, user_id: str, profile_id: str, status: str, error: Optional[str] = None) -> None:
+        """Persist the status of a background generation job to astrology_jobs/{job_id}"""
+        payload = {
+            'user_id': user_id,
+            'profile_id': profile_id,
+            'status': status,
+            'error': error,
+            'updated_at': firestore.SERVER_TIMESTAMP,
+        }
+        try:
+            doc_ref = self.db.collection('astrology_jobs').document(job_id)
+            await asyncio.to_thread(doc_ref.set, payload, merge=True)
+        except Exception as e:
+            logger.warning(f"Failed to record status '{status}' for job {job_id}: {e}")
+
+    async def enqueue_chart_generation(self, user_id: str, profile_id: str, birth_details: Dict[str, Any]) -> str:
+        """
+        Queue chart generation without waiting for it to finish
+
+        Args:
+            user_id: User ID
+            profile_id: Profile ID
+            birth_details: Birth details dictionary
+
+        Returns:
+            str: Job id (same as the chart id); a job already running for it is reused.
+            The "queued" status is recorded before this returns, so an immediate
+            status poll never sees a missing or previous job.
+        """
+        job_id = f"{user_id}_{profile_id}"
+        running = self._generation_jobs.get(job_id)
+        if running is not None and not running.done():
+            return job_id
+
+        # Registered before any await so a concurrent request sees the job and reuses it;
+        # the worker waits for the "queued" write so it cannot overwrite a later status
+        self._job_states[job_id] = "queued"
+        queued = asyncio.ensure_future(self._set_job_status(job_id, user_id, profile_id, "queued"))
+        task = asyncio.create_task(self._run_generation_job(job_id, user_id, profile_id, birth_details, queued))
+        self._generation_jobs[job_id] = task
+
+        def _discard(t: asyncio.Task, key: str = job_id) -> None:
+            if self._generation_jobs.get(key) is t:
+                del self._generation_jobs[key]
+                self._job_states.pop(key, None)
+
+        task.add_done_callback(_discard)
+        await asyncio.shield(queued)
+        return job_id
+
+    async def _run_generation_job(
+        self, job_id: str, user_id: str, profile_id: str, birth_details: Dict[str, Any], queued: asyncio.Future
+    ) -> None:
+        """Worker body for a queued generation job; waits for a free slot first"""
+        try:
+            await queued
+            async with self._get_generation_slots():
+                self._job_states[job_id] = "processing"
+                await self._set_job_status(job_id, user_id, profile_id, "processing")
+                await self.generate_astrology_chart(user_id, profile_id, birth_details)
+        except asyncio.CancelledError:
+            await self._set_job_status(job_id, user_id, profile_id, "failed", "cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Background chart generation failed for job {job_id}: {e}")
+            await self._set_job_status(job_id, user_id, profile_id, "failed", str(e))
+            return
+        await self._set_job_status(job_id, user_id, profile_id, "completed")
+
+    async def get_generation_job(self, user_id: str, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the latest background generation job for a profile
+
+        Returns:
+            Job document (status, error, updated_at) or None if never queued.
+            A job running in this process is reported from its live state.
+            A queued/processing job that has not been updated within
+            _JOB_STALE_SECONDS is reported as failed (it was lost, e.g. on restart).
+        """
+        job_id = f"{user_id}_{profile_id}"
+        running = self._generation_jobs.get(job_id)
+        if running is not None and not running.done():
+            return {
+                'user_id': user_id,
+                'profile_id': profile_id,
+                'status': self._job_states.get(job_id, "queued"),
+                'error': None,
+            }
+        try:
+            doc = await asyncio.to_thread(self.db.collection('astrology_jobs').document(job_id).get)
+            if doc.exists:
+                job = doc.to_dict()
+                if _is_stale_job(job, datetime.now(timezone.utc)):
+                    job['status'] = 'failed'
+                    job['error'] = 'Job was interrupted before completion'
+                return job
+        except Exception as e:
+            logger.error(f"Failed to read generation job {job_id}: {e}")
+        return None
+
     async def _fetch_all_charts(self, birth_details: Dict[str, Any]) -> Dict[str, Any]:
         """
         Fetch all astrology charts from external API
@@ -251,19 +710,26 @@ class AstrologyService:
             Dict containing all chart data
         """
         charts_data = {}
-        cache_dir = "cache/astrology"
-        os.makedirs(cache_dir, exist_ok=True)
-
-        for chart_type, url in self.api_endpoints.items():
-            cache_file = os.path.join(cache_dir, f"{chart_type}_{birth_details['year']}_{birth_details['month']}_{birth_details['date']}.json")
-
-            try:
-                data = await self._fetch_chart_with_cache(url, birth_details, cache_file)
-                charts_data[chart_type] = data
-                logger.info(f"Successfully fetched {chart_type} chart")
-            except Exception as e:
-                logger.warning(f"Failed to fetch {chart_type} chart: {e}")
+        chart_types = list(self.api_endpoints)
+
+        results = await asyncio.gather(
+            *(
+                self._fetch_chart_with_cache(
+                    self.api_endpoints[chart_type],
+                    birth_details,
+                    self._cache_file(chart_type, birth_details),
+                )
+                for chart_type in chart_types
+            ),
+            return_exceptions=True,
+        )
+        for chart_type, result in zip(chart_types, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to fetch {chart_type} chart: {result}")
                 charts_data[chart_type] = {}
+            else:
+                charts_data[chart_type] = result
+                logger.info(f"Successfully fetched {chart_type} chart")
 
         return charts_data
 
@@ -274,22 +740,40 @@ class AstrologyService:
         Args:
             url: API endpoint URL
             details: Request payload
-            cache_file: Cache file path
+            cache_file: msgpack cache file path (see _cache_file)
 
         Returns:
-            Chart data dictionary
+            Chart data dictionary. The same object is handed to every caller (and kept
+            in the in-process cache), so callers must not mutate it; copy it first.
         """
-        # Check cache first
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, "r") as f:
-                    logger.info(f"Loading {cache_file} from cache")
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load cache file {cache_file}: {e}")
-
-        # Fetch from API
-        headers = {"x-api-key": self.free_astro_api_key}
+        # Check the in-process cache first
+        cached = self._response_cache.get(cache_file)
+        if cached is not None:
+            return cached
+
+        # Identical cold requests (same chart type and birth details) share one load
+        pending = self._pending_fetches.get(cache_file)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load_chart(url, details, cache_file))
+            self._pending_fetches[cache_file] = pending
+            pending.add_done_callback(lambda _f, key=cache_file: self._pending_fetches.pop(key, None))
+        # Shielded so one cancelled caller does not abort the fetch for the others
+        return await asyncio.shield(pending)
+
+    def _cache_response(self, cache_file: str, data: Any) -> None:
+        try:
+            self._response_cache[cache_file] = data
+        except ValueError:
+            # Larger than the whole cache budget; serve it from disk next time instead
+            logger.warning(f"Chart payload for {cache_file} too large for the in-process cache")
+
+    async def _load_chart(self, url: str, details: Dict[str, Any], cache_file: str) -> Dict[str, Any]:
+        """Load a chart from the disk cache or the upstream API, filling both caches"""
+        # Disk I/O runs in a worker thread to keep the loop free
+        cached = await asyncio.to_thread(_read_cache_entry, cache_file)
+        if cached is not None:
+            self._cache_response(cache_file, cached)
+            return cached
 
         # Ensure only JSON-serializable payload is sent to external APIs
         payload = self._normalize_birth_details(details)
@@ -299,29 +783,46 @@ class AstrologyService:
             log_keys = list(payload.keys())
         logger.info(f"Calling astrology API {url} with payload keys: {log_keys}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-
-            if response.status_code == 200:
-                data = response.json()
-                # Cache the result
-                try:
-                    with open(cache_file, "w") as f:
-                        json.dump(data, f)
-                    logger.info(f"Cached {cache_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to cache {cache_file}: {e}")
+        client = get_http_client()
+        # ASTRO_API_MAX_RETRIES is the total number of attempts, including the first
+        last_attempt = max(settings.astro_api_max_retries, 1) - 1
+        for attempt in range(last_attempt + 1):
+            try:
+                async with self._get_inflight():
+                    async with self._rate_limiter:
+                        response = await client.post(url, json=payload, headers=self._api_headers)
+            except httpx.TransportError as e:
+                if attempt == last_attempt:
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Astrology API request to {url} failed ({e!r}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code not in _RETRYABLE_STATUS or attempt == last_attempt:
+                break
+            delay = _backoff_delay(attempt, floor=_retry_after_seconds(response))
+            logger.warning(f"Astrology API returned {response.status_code} on {url}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            self._cache_response(cache_file, data)
+            # Cache the result
+            try:
+                await asyncio.to_thread(_write_cache_entry, cache_file, data)
+                logger.info(f"Cached {cache_file}")
+            except Exception as e:
+                logger.warning(f"Failed to cache {cache_file}: {e}")
 
-                time.sleep(1)  # Rate limiting
-                return data
-            elif response.status_code == 429:
-                raise Exception("Rate limit exceeded. Please try again later.")
-            elif response.status_code == 403:
-                raise Exception("Authentication failed. Check API key.")
-            elif response.status_code == 404:
-                raise Exception(f"Endpoint not found: {url}")
-            else:
-                raise Exception(f"API Error {response.status_code}: {response.text}")
+            return data
+        elif response.status_code == 429:
+            raise Exception("Rate limit exceeded. Please try again later.")
+        elif response.status_code == 403:
+            raise Exception("Authentication failed. Check API key.")
+        elif response.status_code == 404:
+            raise Exception(f"Endpoint not found: {url}")
+        else:
+            raise Exception(f"API Error {response.status_code}: {response.text}")
 
     def _extract_moon_longitude(self, rasi_data: Dict[str, Any]) -> Optional[float]:
         """
@@ -329,9 +830,16 @@ class AstrologyService:
         """
         try:
             # Shape A: {"output": [ { "<id>": { "name": "Moon", "fullDegree": ... }, ... } ]}
-            if isinstance(rasi_data.get("output"), list) and rasi_data["output"]:
-                maybe_map = rasi_data["output"][0]
+            output = rasi_data.get("output")
+            if isinstance(output, list) and output:
+                maybe_map = output[0]
                 if isinstance(maybe_map, dict):
+                    # Fast path: upstream keeps Moon at index "2" (after Ascendant and Sun)
+                    item = maybe_map.get("2")
+                    if isinstance(item, dict) and item.get("name") == "Moon":
+                        val = item.get("fullDegree")
+                        if val is not None:
+                            return float(val)
                     for item in maybe_map.values():
                         name = item.get("name") or item.get("planet") or item.get("Planet") or ""
                         if str(name).lower() == "moon":
@@ -378,70 +886,68 @@ class AstrologyService:
             logger.warning("Moon longitude not available, using default for Dasha calculation")
             moon_longitude = 0
 
-        nakshatra_size = 13.3333333
         # Derive nakshatra index from Moon's longitude (0..26), clamp to bounds
-        nakshatra_index_raw = int(moon_longitude // nakshatra_size)
+        nakshatra_index_raw = int(moon_longitude * 3.0 // 40.0)
         if nakshatra_index_raw < 0:
             nakshatra_index_raw = 0
         elif nakshatra_index_raw > 26:
             nakshatra_index_raw = 26
 
-        # Resolve Vimshottari order safely (9 lords repeating over 27 nakshatras)
-        order = self.vimshottari_order or self._get_or_init_vimshottari_order()
+        # Resolve Vimshottari order safely (9 lords repeating over 27 nakshatras).
+        # Loaded off the event loop at startup/generation; never hit Firestore here.
+        order = type(self)._vimshottari_order
         if not order:
             logger.warning("Vimshottari order unavailable, using fallback list")
-            order = [
-                ("Ketu", 7),
-                ("Venus", 20),
-                ("Sun", 6),
-                ("Moon", 10),
-                ("Mars", 7),
-                ("Rahu", 18),
-                ("Jupiter", 16),
-                ("Saturn", 19),
-                ("Mercury", 17),
-            ]
+            order = _DEFAULT_VIMSHOTTARI_ORDER
 
         idx0 = nakshatra_index_raw % len(order)
         lord, full_years = order[idx0]
 
-        nakshatra_start = nakshatra_index_raw * nakshatra_size
-        nakshatra_progress = moon_longitude - nakshatra_start
-        balance_fraction = (nakshatra_size - nakshatra_progress) / nakshatra_size
+        nakshatra_progress = moon_longitude - nakshatra_index_raw * _NAKSHATRA_SIZE
+        balance_fraction = 1.0 - nakshatra_progress * (3.0 / 40.0)
         balance_years = full_years * balance_fraction
 
+        # Fields are built here with their final types, so periods skip validation
         dasha_sequence = []
         current_time = birth_datetime
+        start_date = current_time.strftime("%Y-%m-%d")
+        start_age = 0.0
 
         # First Dasha (partial)
-        dasha_end = current_time + relativedelta(years=int(balance_years),
-                                                 months=int((balance_years % 1) * 12))
-        dasha_sequence.append(DashaPeriod(
+        dasha_end = _add_years_months(current_time, int(balance_years), int((balance_years % 1) * 12))
+        end_date = dasha_end.strftime("%Y-%m-%d")
+        end_age = (dasha_end - birth_datetime).days / 365.25
+        dasha_sequence.append(DashaPeriod.model_construct(
             planet=lord,
-            start_date=current_time.strftime("%Y-%m-%d"),
-            end_date=dasha_end.strftime("%Y-%m-%d"),
-            start_age=round((current_time - birth_datetime).days / 365.25, 2),
-            end_age=round((dasha_end - birth_datetime).days / 365.25, 2)
+            start_date=start_date,
+            end_date=end_date,
+            start_age=round(start_age, 2),
+            end_age=round(end_age, 2)
         ))
         current_time = dasha_end
 
-        # Remaining Dashas
-        order_index = idx0
-        for i in range(1, len(order) * 12):
-            order_index = (idx0 + i) % len(order)
-            lord, full_years = order[order_index]
-            dasha_end = current_time + relativedelta(years=full_years)
-
-            dasha_sequence.append(DashaPeriod(
+        # Remaining Dashas; each start is the previous end, so reuse its formatted date and age
+        order_len = len(order)
+        # Enough periods to pass 120 years even if every remaining lord had the shortest span
+        shortest = max(min(years for _, years in order), 1)
+        max_periods = min(order_len * 12, int((120 - balance_years) // shortest) + 2)
+        for i in range(1, max_periods):
+            lord, full_years = order[(idx0 + i) % order_len]
+            start_date, start_age = end_date, end_age
+            dasha_end = _add_years_months(current_time, full_years)
+            end_date = dasha_end.strftime("%Y-%m-%d")
+            end_age = (dasha_end - birth_datetime).days / 365.25
+
+            dasha_sequence.append(DashaPeriod.model_construct(
                 planet=lord,
-                start_date=current_time.strftime("%Y-%m-%d"),
-                end_date=dasha_end.strftime("%Y-%m-%d"),
-                start_age=round((current_time - birth_datetime).days / 365.25, 2),
-                end_age=round((dasha_end - birth_datetime).days / 365.25, 2)
+                start_date=start_date,
+                end_date=end_date,
+                start_age=round(start_age, 2),
+                end_age=round(end_age, 2)
             ))
 
             current_time = dasha_end
-            if (current_time - birth_datetime).days / 365.25 >= 120:
+            if end_age >= 120:
                 break
 
         return dasha_sequence
@@ -456,13 +962,10 @@ class AstrologyService:
         Returns:
             Structured astrology data
         """
-        structured = {
-            "houses": {f"house_{i}": HouseData() for i in range(1, 13)},
-            "career": {},
-            "finance": {},
-            "health": {},
-            "travel": {}
-        }
+        shadbala_out = (shadbala or {}).get("output", {}) or {}
+
+        # Single pass: bucket planets by house number, materialize HouseData at the end
+        house_planets: Dict[int, List[PlanetData]] = defaultdict(list)
 
         # Process Rasi planets
         if rasi and rasi.get("output"):
@@ -474,39 +977,48 @@ class AstrologyService:
                         name=planet_data.get("name"),
                         sign=planet_data.get("current_sign"),
                         degree=planet_data.get("fullDegree"),
-                        strength=shadbala.get("output", {}).get(planet_data.get("name"), {}).get("Shadbala") if shadbala else None,
+                        strength=(shadbala_out.get(planet_data.get("name")) or {}).get("Shadbala") if shadbala else None,
                         house_number=house_num,
                         current_sign=planet_data.get("current_sign"),
                         fullDegree=planet_data.get("fullDegree")
                     )
-                    structured["houses"][f"house_{house_num}"].planets.append(planet)
+                    house_planets[house_num].append(planet)
+
+        structured = {
+            # Planets are already validated, so skip re-validation when wrapping them
+            "houses": {key: HouseData.model_construct(planets=house_planets[i]) for i, key in enumerate(_HOUSE_KEYS, 1)},
+            "career": {},
+            "finance": {},
+            "health": {},
+            "travel": {}
+        }
 
         # Career data
         structured["career"] = {
-            "10th_house_planets": structured["houses"]["house_10"].planets,
+            "10th_house_planets": house_planets[10],
             "d10_summary": d10.get("output", {}),
-            "strengths": shadbala.get("output", {}) if shadbala else {}
+            "strengths": shadbala_out
         }
 
         # Finance data
         structured["finance"] = {
-            "2nd_house_planets": structured["houses"]["house_2"].planets,
-            "11th_house_planets": structured["houses"]["house_11"].planets,
-            "strengths": shadbala.get("output", {}) if shadbala else {}
+            "2nd_house_planets": house_planets[2],
+            "11th_house_planets": house_planets[11],
+            "strengths": shadbala_out
         }
 
         # Health data
         structured["health"] = {
-            "6th_house_planets": structured["houses"]["house_6"].planets,
-            "8th_house_planets": structured["houses"]["house_8"].planets,
-            "strengths": shadbala.get("output", {}) if shadbala else {}
+            "6th_house_planets": house_planets[6],
+            "8th_house_planets": house_planets[8],
+            "strengths": shadbala_out
         }
 
         # Travel data
         structured["travel"] = {
-            "3rd_house_planets": structured["houses"]["house_3"].planets,
-            "12th_house_planets": structured["houses"]["house_12"].planets,
-            "strengths": shadbala.get("output", {}) if shadbala else {}
+            "3rd_house_planets": house_planets[3],
+            "12th_house_planets": house_planets[12],
+            "strengths": shadbala_out
         }
 
         return structured
@@ -545,30 +1057,10 @@ class AstrologyService:
                     pass
 
                 # Fallback to default order if not present or invalid
-                return [
-                    ("Ketu", 7),
-                    ("Venus", 20),
-                    ("Sun", 6),
-                    ("Moon", 10),
-                    ("Mars", 7),
-                    ("Rahu", 18),
-                    ("Jupiter", 16),
-                    ("Saturn", 19),
-                    ("Mercury", 17),
-                ]
+                return _DEFAULT_VIMSHOTTARI_ORDER
             else:
                 # Initialize with default values
-                default_order = [
-                    ("Ketu", 7),
-                    ("Venus", 20),
-                    ("Sun", 6),
-                    ("Moon", 10),
-                    ("Mars", 7),
-                    ("Rahu", 18),
-                    ("Jupiter", 16),
-                    ("Saturn", 19),
-                    ("Mercury", 17),
-                ]
+                default_order = _DEFAULT_VIMSHOTTARI_ORDER
 
                 # Convert to Firestore-compatible format (no nested arrays)
                 firestore_order = [
@@ -587,66 +1079,33 @@ class AstrologyService:
         except Exception as e:
             logger.error(f"Failed to get Vimshottari order from database: {e}")
             # Fallback to hardcoded values
-            fallback_order = [
-                ("Ketu", 7),
-                ("Venus", 20),
-                ("Sun", 6),
-                ("Moon", 10),
-                ("Mars", 7),
-                ("Rahu", 18),
-                ("Jupiter", 16),
-                ("Saturn", 19),
-                ("Mercury", 17),
-            ]
             logger.info("Using fallback Vimshottari order")
-            return fallback_order
+            return _DEFAULT_VIMSHOTTARI_ORDER
 
-    async def _save_chart_to_db(self, chart: AstrologyChart) -> None:
+    async def _save_chart_to_db(self, chart: AstrologyChart, parts: Optional[Dict[str, Any]] = None) -> None:
         """
         Save astrology chart to Firestore
 
         Args:
             chart: AstrologyChart object to save
+            parts: Raw chart parts to store on the astrology_profile doc in the same batch
         """
         try:
             doc_id = f"{chart.user_id}_{chart.profile_id}"
             doc_ref = self.db.collection('astrology_charts').document(doc_id)
             chart.updated_at = datetime.utcnow()
 
-            # Convert chart to dict with proper datetime handling
+            # Pydantic emits JSON-safe primitives for the nested chart data in one
+            # pass; top-level timestamps stay native so Firestore stores them as
+            # sortable Timestamps, with updated_at taken from the server clock
             try:
-                if hasattr(chart, 'dict'):
-                    chart_dict = chart.dict()
-                else:
-                    chart_dict = chart.__dict__
-
-                # Convert datetime objects to strings with proper handling
-                def convert_datetime(obj):
-                    if isinstance(obj, datetime):
-                        return obj.isoformat()
-                    elif isinstance(obj, date):
-                        return obj.isoformat()
-                    elif isinstance(obj, time):
-                        return obj.isoformat()
-                    elif hasattr(obj, '__dict__'):
-                        # Handle nested objects properly
-                        if hasattr(obj, 'dict') and callable(getattr(obj, 'dict')):
-                            return convert_datetime(obj.dict())
-                        else:
-                            return convert_datetime(obj.__dict__)
-                    elif isinstance(obj, list):
-                        return [convert_datetime(item) for item in obj]
-                    elif isinstance(obj, dict):
-                        return {key: convert_datetime(value) for key, value in obj.items()}
-                    else:
-                        return obj
-
-                chart_dict = convert_datetime(chart_dict)
-                doc_ref.set(chart_dict)
+                chart_dict = chart.model_dump(mode="json", exclude={"created_at", "updated_at"})
+                chart_dict['created_at'] = chart.created_at
+                chart_dict['updated_at'] = firestore.SERVER_TIMESTAMP
             except Exception as e:
                 logger.error(f"Failed to save chart to database: {e}")
                 # Save basic structure as fallback
-                doc_ref.set({
+                chart_dict = {
                     'user_id': chart.user_id,
                     'profile_id': chart.profile_id,
                     'houses': {},
@@ -655,38 +1114,54 @@ class AstrologyService:
                     'health': {},
                     'travel': {},
                     'vimshottari_dasha': [],
-                    'created_at': datetime.utcnow().isoformat(),
-                    'updated_at': datetime.utcnow().isoformat(),
+                    'created_at': chart.created_at,
+                    'updated_at': firestore.SERVER_TIMESTAMP,
                     'is_active': True
-                })
+                }
+
+            # Invalidated on both sides of the write: reads finishing mid-write must not re-cache the old chart
+            self._invalidate_chart(doc_id)
+            try:
+                if parts is None:
+                    await asyncio.to_thread(doc_ref.set, chart_dict)
+                else:
+                    parts_payload = self._chart_parts_payload(chart.user_id, chart.profile_id, parts)
+                    await asyncio.to_thread(
+                        self._commit_chart_batch, doc_ref, chart_dict, self._profile_ref(doc_id), parts_payload
+                    )
+            finally:
+                self._invalidate_chart(doc_id)
+            if parts is not None:
+                self._invalidate_profile(doc_id)
+                self._forget_hashes(doc_id, 'chart_parts.')
+                logger.info(f"Saved astrology chart parts for {doc_id}")
             logger.info(f"Saved astrology chart {doc_id} to database")
         except Exception as e:
             logger.error(f"Failed to save astrology chart to database: {e}")
             raise
 
+    def _commit_chart_batch(self, chart_ref, chart_dict: Dict[str, Any], profile_ref, parts_payload: Dict[str, Any]) -> None:
+        """
+        Write the combined chart and its raw parts in a single batch commit.
+
+        The profile doc is updated in place so created_at survives without a read;
+        if it does not exist yet the batch fails atomically and is retried as a create.
+        """
+        batch = self.db.batch()
+        batch.set(chart_ref, chart_dict)
+        batch.update(profile_ref, parts_payload)
+        try:
+            batch.commit()
+        except NotFound:
+            batch = self.db.batch()
+            batch.set(chart_ref, chart_dict)
+            batch.set(profile_ref, _nest_field_paths({**parts_payload, 'created_at': firestore.SERVER_TIMESTAMP}), merge=True)
+            batch.commit()
+
     def _chart_to_dict(self, chart: AstrologyChart) -> Dict[str, Any]:
         """Convert AstrologyChart to dictionary with proper datetime handling"""
         try:
-            chart_dict = chart.dict() if hasattr(chart, 'dict') else chart.__dict__
-
-            # Handle datetime serialization
-            def convert_datetime(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, time):
-                    return obj.isoformat()
-                elif hasattr(obj, '__dict__'):
-                    return self._chart_to_dict(obj)
-                elif isinstance(obj, list):
-                    return [convert_datetime(item) for item in obj]
-                elif isinstance(obj, dict):
-                    return {key: convert_datetime(value) for key, value in obj.items()}
-                else:
-                    return obj
-
-            return convert_datetime(chart_dict)
+            return chart.model_dump(mode="json")
         except Exception as e:
             logger.error(f"Failed to convert chart to dict: {e}")
             # Return basic structure as fallback
@@ -702,73 +1177,113 @@ class AstrologyService:
                 'updated_at': datetime.utcnow().isoformat()
             }
 
-    # Persist raw parts for Rasi/Navamsa/D10/Chandra/Shadbala
-    async def _save_chart_parts_to_db(self, user_id: str, profile_id: str, parts: Dict[str, Any]) -> None:
-        try:
-            doc_id = f"{user_id}_{profile_id}"
-            doc_ref = self.db.collection('astrology_chart_parts').document(doc_id)
+    # Raw parts for Rasi/Navamsa/D10/Chandra/Shadbala
+    def _chart_parts_payload(self, user_id: str, profile_id: str, parts: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'user_id': user_id,
+            'profile_id': profile_id,
+            # Upstream JSON is already Firestore-safe; replaces the whole
+            # chart_parts map, leaving extras untouched
+            'chart_parts': {
+                'rasi': parts.get('rasi', {}),
+                'navamsa': parts.get('navamsa', {}),
+                'd10': parts.get('d10', {}),
+                'chandra': parts.get('chandra', {}),
+                'shadbala': parts.get('shadbala', {}),
+            },
+            'updated_at': firestore.SERVER_TIMESTAMP
+        }
 
-            # Preserve created_at if updating
-            existing = doc_ref.get()
-            created_at = None
-            if existing.exists:
-                try:
-                    existing_data = existing.to_dict() or {}
-                    created_at = existing_data.get('created_at')
-                except Exception:
-                    created_at = None
-
-            def convert_datetime(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, time):
-                    return obj.isoformat()
-                elif hasattr(obj, '__dict__'):
-                    try:
-                        return convert_datetime(obj.__dict__)
-                    except Exception:
-                        return str(obj)
-                elif isinstance(obj, list):
-                    return [convert_datetime(item) for item in obj]
-                elif isinstance(obj, dict):
-                    return {k: convert_datetime(v) for k, v in obj.items()}
-                else:
-                    return obj
+    def _changed_fields(self, key: str, fields: Dict[str, Any]) -> Dict[str, str]:
+        """Return {field: hash} for the fields whose content differs from the last write under key"""
+        known = self._content_hashes.get(key) or {}
+        changed = {}
+        for name, value in fields.items():
+            digest = hashlib.blake2b(
+                orjson.dumps(value, default=_orjson_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+                digest_size=16,
+            ).hexdigest()
+            if known.get(name) != digest:
+                changed[name] = digest
+        return changed
+
+    def _remember_hashes(self, key: str, hashes: Dict[str, str]) -> None:
+        self._content_hashes[key] = {**(self._content_hashes.get(key) or {}), **hashes}
+
+    def _forget_hashes(self, key: str, prefix: str) -> None:
+        known = self._content_hashes.get(key)
+        if known:
+            self._content_hashes[key] = {k: v for k, v in known.items() if not k.startswith(prefix)}
+
+    def _write_preserving_created_at(self, doc_ref, payload: Dict[str, Any]) -> None:
+        """
+        Write payload fields into doc_ref without reading it first.
 
-            payload = {
-                'user_id': user_id,
-                'profile_id': profile_id,
-                'rasi': convert_datetime(parts.get('rasi', {})),
-                'navamsa': convert_datetime(parts.get('navamsa', {})),
-                'd10': convert_datetime(parts.get('d10', {})),
-                'chandra': convert_datetime(parts.get('chandra', {})),
-                'shadbala': convert_datetime(parts.get('shadbala', {})),
-                'updated_at': datetime.utcnow().isoformat()
-            }
-            if created_at:
-                payload['created_at'] = created_at
-            else:
-                payload['created_at'] = datetime.utcnow().isoformat()
+        update() only succeeds on an existing document, so created_at is left
+        untouched in a single round trip. On first write it raises NotFound and
+        the document is created with a server-side created_at timestamp.
+        Dotted keys (e.g. 'chart_parts.rasi') are nested field paths.
+        """
+        try:
+            doc_ref.update(payload)
+        except NotFound:
+            doc_ref.set(_nest_field_paths({**payload, 'created_at': firestore.SERVER_TIMESTAMP}), merge=True)
 
-            doc_ref.set(payload)
-            logger.info(f"Saved astrology chart parts for {doc_id}")
-        except Exception as e:
-            logger.error(f"Failed to save chart parts to database: {e}")
-            # Do not raise; generation should continue
+    async def _get_profile_doc(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the astrology_profile document through the in-process TTL cache.
+
+        Concurrent misses for the same document (e.g. a dashboard loading every
+        chart tab at once) share a single Firestore read.
+        """
+        data = self._profile_cache.get(doc_id)
+        if data is not None:
+            return data
+        pending = self._profile_reads.get(doc_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load_profile_doc(doc_id))
+            self._profile_reads[doc_id] = pending
+
+            def _discard(f: asyncio.Future, key: str = doc_id) -> None:
+                if self._profile_reads.get(key) is f:
+                    del self._profile_reads[key]
+
+            pending.add_done_callback(_discard)
+        # Shielded so one cancelled caller does not abort the read for the others
+        return await asyncio.shield(pending)
+
+    async def _load_profile_doc(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        epoch = self._profile_write_epoch
+        doc = await asyncio.to_thread(self._profile_ref(doc_id).get)
+        if not doc.exists:
+            return None
+        data = doc.to_dict() or {}
+        # A write that landed while this read was in flight may have made it stale
+        if epoch == self._profile_write_epoch:
+            self._profile_cache[doc_id] = data
+        return data
+
+    def _invalidate_profile(self, doc_id: str) -> None:
+        """Drop a profile doc from the read cache and detach its in-flight read so it cannot re-cache it"""
+        self._profile_write_epoch += 1
+        self._profile_cache.pop(doc_id, None)
+        self._profile_reads.pop(doc_id, None)
 
     async def get_chart_part(self, user_id: str, profile_id: str, chart_type: str) -> Optional[Dict[str, Any]]:
         try:
             chart_type = (chart_type or '').lower()
-            valid = {'rasi', 'navamsa', 'd10', 'chandra', 'shadbala'}
-            if chart_type not in valid:
+            if chart_type not in _VALID_CHART_TYPES:
                 logger.warning(f"Invalid chart_type requested: {chart_type}")
                 return None
 
             doc_id = f"{user_id}_{profile_id}"
-            doc_ref = self.db.collection('astrology_chart_parts').document(doc_id)
-            doc = doc_ref.get()
+            profile = await self._get_profile_doc(doc_id)
+            part = ((profile or {}).get('chart_parts') or {}).get(chart_type)
+            if part:
+                return part
+
+            # Fall back to the legacy per-collection document
+            doc = await asyncio.to_thread(self._chart_parts_ref(doc_id).get)
             if not doc.exists:
                 logger.info(f"Chart parts not found for {doc_id}")
                 return None
@@ -792,81 +1307,116 @@ class AstrologyService:
         Returns:
             The fetched chart part data or None on failure
         """
-        valid = {'rasi', 'navamsa', 'd10', 'chandra', 'shadbala'}
         ct = (chart_type or '').lower()
-        if ct not in valid:
-            raise ValueError(f"Invalid chart_type '{chart_type}', must be one of {sorted(list(valid))}")
+        if ct not in _VALID_CHART_TYPES:
+            raise ValueError(f"Invalid chart_type '{chart_type}', must be one of {sorted(_VALID_CHART_TYPES)}")
 
         url = self.api_endpoints.get(ct)
         if not url:
             raise ValueError(f"No API endpoint configured for chart_type '{chart_type}'")
 
-        # Build cache file path consistent with _fetch_all_charts
-        cache_dir = "cache/astrology"
-        os.makedirs(cache_dir, exist_ok=True)
-        try:
-            year = birth_details.get('year')
-            month = birth_details.get('month')
-            datev = birth_details.get('date') or birth_details.get('day')
-        except Exception:
-            year = month = datev = None
-        cache_file = os.path.join(cache_dir, f"{ct}_{year}_{month}_{datev}.json")
+        cache_file = self._cache_file(ct, birth_details)
 
         try:
             # Fetch the single chart part (payload normalization happens inside)
             data = await self._fetch_chart_with_cache(url, birth_details, cache_file)
 
-            # Write/merge to Firestore chart parts doc
+            # Write/merge to the Firestore astrology profile doc
             doc_id = f"{user_id}_{profile_id}"
-            doc_ref = self.db.collection('astrology_chart_parts').document(doc_id)
+            doc_ref = self._profile_ref(doc_id)
 
-            # Preserve created_at if updating
-            existing = doc_ref.get()
-            created_at = None
-            if existing.exists:
-                try:
-                    existing_data = existing.to_dict() or {}
-                    created_at = existing_data.get('created_at')
-                except Exception:
-                    created_at = None
-
-            # Reuse serializer from _save_chart_parts_to_db
-            def convert_datetime(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, time):
-                    return obj.isoformat()
-                elif hasattr(obj, '__dict__'):
-                    try:
-                        return convert_datetime(obj.__dict__)
-                    except Exception:
-                        return str(obj)
-                elif isinstance(obj, list):
-                    return [convert_datetime(item) for item in obj]
-                elif isinstance(obj, dict):
-                    return {k: convert_datetime(v) for k, v in obj.items()}
-                else:
-                    return obj
+            field = f"chart_parts.{ct}"
+            changed = self._changed_fields(doc_id, {field: data})
+            if not changed:
+                logger.info(f"Chart part '{ct}' unchanged for {doc_id}; skipping write")
+                return data
 
             payload = {
-                ct: convert_datetime(data),
-                'updated_at': datetime.utcnow().isoformat()
+                'user_id': user_id,
+                'profile_id': profile_id,
+                field: data,
+                'updated_at': firestore.SERVER_TIMESTAMP
             }
-            if created_at:
-                payload['created_at'] = created_at
-            else:
-                payload['created_at'] = datetime.utcnow().isoformat()
 
-            # Merge update to keep other parts untouched
-            doc_ref.set(payload, merge=True)
+            # Field-path update keeps other parts and extras untouched
+            await asyncio.to_thread(self._write_preserving_created_at, doc_ref, payload)
+            self._invalidate_profile(doc_id)
+            self._remember_hashes(doc_id, changed)
             logger.info(f"Saved single chart part '{ct}' for {doc_id}")
             return data
         except Exception as e:
             logger.error(f"Failed to generate chart part '{chart_type}' for {user_id}_{profile_id}: {e}")
             return None
 
+    async def generate_chart_parts(self, user_id: str, profile_id: str, birth_details: Dict[str, Any], chart_types: List[str]) -> Dict[str, Any]:
+        """
+        Generate several chart parts concurrently and persist them in one write.
+
+        All parts live in the chart_parts map of the same astrology_profile document,
+        so the fetched parts are merged into a single payload instead of one write per part.
+
+        Args:
+            user_id: User ID
+            profile_id: Profile ID
+            birth_details: Raw birth details (strings/ints acceptable) - normalized internally
+            chart_types: Any of rasi | navamsa | d10 | chandra | shadbala
+
+        Returns:
+            Mapping of chart_type to fetched data for the parts that succeeded
+        """
+        requested = []
+        for chart_type in chart_types or []:
+            ct = (chart_type or '').lower()
+            if ct not in _VALID_CHART_TYPES:
+                raise ValueError(f"Invalid chart_type '{chart_type}', must be one of {sorted(_VALID_CHART_TYPES)}")
+            if not self.api_endpoints.get(ct):
+                raise ValueError(f"No API endpoint configured for chart_type '{chart_type}'")
+            if ct not in requested:
+                requested.append(ct)
+        if not requested:
+            return {}
+
+        results = await asyncio.gather(
+            *(
+                self._fetch_chart_with_cache(
+                    self.api_endpoints[ct],
+                    birth_details,
+                    self._cache_file(ct, birth_details),
+                )
+                for ct in requested
+            ),
+            return_exceptions=True,
+        )
+
+        parts: Dict[str, Any] = {}
+        for ct, result in zip(requested, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch chart part '{ct}' for {user_id}_{profile_id}: {result}")
+                continue
+            parts[ct] = result
+        if not parts:
+            return {}
+
+        doc_id = f"{user_id}_{profile_id}"
+        try:
+            fields = {f"chart_parts.{ct}": data for ct, data in parts.items()}
+            changed = self._changed_fields(doc_id, fields)
+            if not changed:
+                logger.info(f"Chart parts {sorted(parts)} unchanged for {doc_id}; skipping write")
+                return parts
+            doc_ref = self._profile_ref(doc_id)
+            payload = {'user_id': user_id, 'profile_id': profile_id}
+            payload.update({field: fields[field] for field in changed})
+            payload['updated_at'] = firestore.SERVER_TIMESTAMP
+            await asyncio.to_thread(self._write_preserving_created_at, doc_ref, payload)
+            self._invalidate_profile(doc_id)
+            self._remember_hashes(doc_id, changed)
+            logger.info(f"Saved chart parts {sorted(changed)} for {doc_id}")
+        except Exception as e:
+            logger.error(f"Failed to save chart parts for {doc_id}: {e}")
+            return {}
+        return parts
+
     async def fetch_planets_extended(self, birth_details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Fetch extended planetary details for dashboard:
@@ -878,12 +1428,7 @@ class AstrologyService:
             if not url:
                 raise ValueError("planets_extended endpoint not configured")
             bd = self._normalize_birth_details(birth_details or {})
-            cache_dir = "cache/astrology"
-            os.makedirs(cache_dir, exist_ok=True)
-            cache_file = os.path.join(
-                cache_dir,
-                f"planets_extended_{bd.get('year')}_{bd.get('month')}_{bd.get('date')}.json"
-            )
+            cache_file = self._cache_file("planets_extended", bd)
             data = await self._fetch_chart_with_cache(url, bd, cache_file)
             logger.info("Fetched planets_extended successfully")
             return data
@@ -900,12 +1445,7 @@ class AstrologyService:
             if not url:
                 raise ValueError("vimsottari endpoint not configured")
             bd = self._normalize_birth_details(birth_details or {})
-            cache_dir = "cache/astrology"
-            os.makedirs(cache_dir, exist_ok=True)
-            cache_file = os.path.join(
-                cache_dir,
-                f"vimsottari_{bd.get('year')}_{bd.get('month')}_{bd.get('date')}.json"
-            )
+            cache_file = self._cache_file("vimsottari", bd)
             data = await self._fetch_chart_with_cache(url, bd, cache_file)
             logger.info("Fetched vimsottari successfully")
             return data
@@ -913,6 +1453,24 @@ class AstrologyService:
             logger.error(f"Failed to fetch vimsottari: {e}")
             return None
 
+    async def fetch_dashboard_extras(self, birth_details: Dict[str, Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch planets_extended and vimsottari concurrently for the dashboard.
+
+        Returns:
+            {'planets_extended': data or None, 'vimsottari': data or None}
+        """
+        bd = self._normalize_birth_details(birth_details or {})
+        planets_extended, vimsottari = await asyncio.gather(
+            self.fetch_planets_extended(bd),
+            self.fetch_vimsottari(bd),
+            return_exceptions=True,
+        )
+        return {
+            'planets_extended': None if isinstance(planets_extended, BaseException) else planets_extended,
+            'vimsottari': None if isinstance(vimsottari, BaseException) else vimsottari,
+        }
+
     async def save_dashboard_extras(
         self,
         user_id: str,
@@ -922,58 +1480,34 @@ class AstrologyService:
     ) -> bool:
         """
         Persist dashboard extras into Firestore:
-        Collection: astrology_dashboard_extras
+        Collection: astrology_profile
         Document:   {user_id}_{profile_id}
-        Fields:     planets_extended, vimsottari, created_at, updated_at
+        Fields:     extras.planets_extended, extras.vimsottari, created_at, updated_at
         """
         try:
             doc_id = f"{user_id}_{profile_id}"
-            doc_ref = self.db.collection('astrology_dashboard_extras').document(doc_id)
+            doc_ref = self._profile_ref(doc_id)
 
-            # Preserve created_at if updating
-            existing = doc_ref.get()
-            created_at = None
-            if existing.exists:
-                try:
-                    existing_data = existing.to_dict() or {}
-                    created_at = existing_data.get('created_at')
-                except Exception:
-                    created_at = None
-
-            def convert_datetime(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, time):
-                    return obj.isoformat()
-                elif hasattr(obj, '__dict__'):
-                    try:
-                        return convert_datetime(obj.__dict__)
-                    except Exception:
-                        return str(obj)
-                elif isinstance(obj, list):
-                    return [convert_datetime(item) for item in obj]
-                elif isinstance(obj, dict):
-                    return {k: convert_datetime(v) for k, v in obj.items()}
-                else:
-                    return obj
+            fields: Dict[str, Any] = {}
+            if planets_extended is not None:
+                fields['extras.planets_extended'] = planets_extended
+            if vimsottari is not None:
+                fields['extras.vimsottari'] = vimsottari
+            changed = self._changed_fields(doc_id, fields)
+            if fields and not changed:
+                logger.info(f"Dashboard extras unchanged for {doc_id}; skipping write")
+                return True
 
             payload: Dict[str, Any] = {
                 'user_id': user_id,
                 'profile_id': profile_id,
-                'updated_at': datetime.utcnow().isoformat()
+                'updated_at': firestore.SERVER_TIMESTAMP
             }
-            if planets_extended is not None:
-                payload['planets_extended'] = convert_datetime(planets_extended)
-            if vimsottari is not None:
-                payload['vimsottari'] = convert_datetime(vimsottari)
-            if created_at:
-                payload['created_at'] = created_at
-            else:
-                payload['created_at'] = datetime.utcnow().isoformat()
+            payload.update({name: fields[name] for name in changed})
 
-            doc_ref.set(payload, merge=True)
+            await asyncio.to_thread(self._write_preserving_created_at, doc_ref, payload)
+            self._invalidate_profile(doc_id)
+            self._remember_hashes(doc_id, changed)
             logger.info(f"Saved dashboard extras for {doc_id}")
             return True
         except Exception as e:
@@ -986,8 +1520,19 @@ class AstrologyService:
         """
         try:
             doc_id = f"{user_id}_{profile_id}"
-            doc_ref = self.db.collection('astrology_dashboard_extras').document(doc_id)
-            doc = doc_ref.get()
+            profile = await self._get_profile_doc(doc_id)
+            extras = (profile or {}).get('extras')
+            if extras:
+                return {
+                    'user_id': profile.get('user_id', user_id),
+                    'profile_id': profile.get('profile_id', profile_id),
+                    **extras,
+                    'created_at': profile.get('created_at'),
+                    'updated_at': profile.get('updated_at'),
+                }
+
+            # Fall back to the legacy per-collection document
+            doc = await asyncio.to_thread(self._extras_ref(doc_id).get)
             if not doc.exists:
                 return None
             return doc.to_dict() or {}
@@ -620,26 +620,111 @@ personalized astrology predictions and marriage compatibility insights.
 """
 
 import os
-import json
+import re
+import time
+import textwrap
+import hashlib
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
-from datetime import datetime, date, time
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+from cachetools import TTLCache
 
 from app.config.settings import settings
 from app.config.firebase import get_firestore_client
 from app.core.exceptions import ValidationError
+from app.utils.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
-# Try to import OpenAI client (the new SDK exposes OpenAI class)
+# Try to import OpenAI client (the new SDK exposes the AsyncOpenAI class)
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, APIConnectionError, RateLimitError
     OPENAI_AVAILABLE = True
+    # Transient failures retried by _retry_with_backoff (APITimeoutError is an APIConnectionError)
+    _RETRYABLE_ERRORS: Tuple[type, ...] = (APIConnectionError, RateLimitError, TimeoutError)
 except Exception:
     OPENAI_AVAILABLE = False
+    _RETRYABLE_ERRORS = (TimeoutError,)
     logger.warning("OpenAI client not available, install with: pip install openai")
 
+# HTTP statuses worth retrying: throttling and transient server errors
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Startup connection warmup gives up quickly; it is only an optimisation
+_WARMUP_TIMEOUT_SECONDS = 5.0
+
+# How long the admin-editable marriage prompt is served from memory before a background refresh
+_PROMPT_CACHE_TTL_SECONDS = 300
+
+# Lines of the free-text compatibility analysis that carry a score (keywords in any order)
+_SCORE_LINE_RE = re.compile(r"^(?=.*compatibility)(?=.*(?:score|percentage)).*$", re.IGNORECASE | re.MULTILINE)
+_GUNA_LINE_RE = re.compile(r"^(?=.*guna)(?=.*score).*$", re.IGNORECASE | re.MULTILINE)
+# Standalone numbers on such a line ("82", "82.5", "78%"); "100):" or "28/36" are not values
+_SCORE_VALUE_RE = re.compile(r"(?<!\S)(\d+(?:\.\d+)?)%?(?!\S)")
+_GUNA_VALUE_RE = re.compile(r"(?<!\S)(\d+)(?!\S)")
+
+# (minimum overall score, level), highest first; the final entry catches everything else
+_COMPATIBILITY_LEVELS = ((85, "excellent"), (70, "good"), (50, "average"), (float("-inf"), "poor"))
+
+# Marriage prompt placeholders such as {MAIN_NAME} or {PARTNER_CHART_DATA}
+_PLACEHOLDER_RE = re.compile(r"\{([A-Z_]+)\}")
+
+
+def _json_default(obj):
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _dump_chart(chart: Any) -> str:
+    """Compact JSON for chart data embedded in prompts (no indentation: it only costs tokens)"""
+    return orjson.dumps(chart, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Output token budgets per prediction type, further capped by OPENAI_MAX_TOKENS; shorter
+# horizons need far less text, and completion latency grows with generated tokens
+_PREDICTION_MAX_TOKENS = {
+    "daily": 900,
+    "weekly": 1800,
+    "monthly": 3000,
+}
+
+# Static system prompt for personal predictions. Kept byte-identical across calls and ahead of
+# the per-user message so the provider can reuse the cached prompt prefix.
+_PREDICTION_SYSTEM_PROMPT = """You are an expert Vedic astrologer with deep knowledge of astrology, zodiac signs, and planetary influences. Provide accurate, personalized predictions based on birth chart data.
+
+For every request, provide a detailed, accurate prediction for the requested period covering:
+1. Overall outlook for the day/week/month
+2. Career and professional matters
+3. Health and well-being
+4. Relationships and personal life
+5. Financial matters
+6. Lucky numbers, colors, and directions
+7. Any precautions or remedies
+
+Make the prediction personal, positive, and actionable. Use traditional Vedic astrology principles."""
+
+
+# Built-in marriage prompt used until an admin stores one. Normalised once at import:
+# indentation and runs of blank lines are sent as input tokens on every uncached call.
+_DEFAULT_MARRIAGE_PROMPT = re.sub(r"\n{3,}", "\n\n", textwrap.dedent("""
+You are Zodira – a Vedic Astrology AI specialized in marriage compatibility analysis.
+Your task is to generate a complete marriage matching report for the given bride and groom data.
+
+... (omitted here for brevity; keep the same default prompt as in your original file) ...
+""")).strip()
+
+
+# OpenAI Batch API statuses after which a job will not change again
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
 
 class ChatGPTService:
     """Service for ChatGPT API integration"""
@@ -647,7 +732,7 @@ class ChatGPTService:
     def __init__(self):
         # Load API key from settings
         self.api_key = getattr(settings, "openai_api_key", None)
-        self.client: Optional[Any] = None
+        self._client: Optional[Any] = None  # Lazy initialization for the OpenAI client
 
         # Modern OpenAI configuration with best practices
         self.model = getattr(settings, "openai_model", "gpt-4o-mini")  # default model
@@ -655,31 +740,59 @@ class ChatGPTService:
         self.temperature = getattr(settings, "openai_temperature", 0.3)
         self.timeout = getattr(settings, "openai_timeout", 30)
         self.max_retries = getattr(settings, "openai_max_retries", 3)
+        self.use_mock_llm = getattr(settings, "use_mock_llm", False)
 
         # Rate limiting configuration
         self.rate_limit_per_minute = getattr(settings, "openai_rate_limit_per_minute", 50)
-        self._last_request_time = 0.0
-        self._request_count = 0
+        # Continuous refill (no window-boundary bursts); small burst allowance for batch fan-out
+        rate_per_second = max(self.rate_limit_per_minute, 1) / 60.0
+        self._rate_limiter = AsyncTokenBucket(rate_per_second, capacity=max(1.0, self.rate_limit_per_minute / 10.0))
+        # Cap on concurrent OpenAI calls from batch fan-out, created inside the running loop
+        self._batch_slots: Optional[asyncio.Semaphore] = None
 
         self._db = None  # Lazy initialization for Firestore client
 
-        # Initialize OpenAI client if possible
-        if not self.api_key:
-            logger.error("❌ OpenAI API key not configured")
+        # (loaded_at monotonic time, prompt) for the marriage compatibility prompt
+        self._marriage_prompt: Optional[Tuple[float, str]] = None
+        self._marriage_prompt_refresh: Optional[asyncio.Task] = None
+
+        # Responses to deterministic (temperature 0) requests, keyed by a hash of the request
+        cache_ttl = getattr(settings, "openai_cache_ttl", 0)
+        self._response_cache: Optional[TTLCache] = TTLCache(maxsize=1024, ttl=cache_ttl) if cache_ttl > 0 else None
+        self._inflight_requests: Dict[str, asyncio.Future] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+
+        if self.use_mock_llm:
+            logger.info("USE_MOCK_LLM enabled: predictions and compatibility use mock responses")
+        elif not self.api_key:
+            logger.warning("⚠️ OpenAI API key not configured, falling back to mock responses")
             # We don't raise here to allow the app to start in dev/test mode;
-            # but many methods will check for client existence and raise appropriately.
+            # the public methods route to the mock generators when there is no client.
         elif not OPENAI_AVAILABLE:
             logger.error("❌ OpenAI client package not installed. Install with: pip install openai")
-        else:
+
+    @property
+    def _mock_only(self) -> bool:
+        """True when requests should be answered by the mock generators without calling OpenAI"""
+        return self.use_mock_llm or not self.client
+
+    @property
+    def client(self):
+        """Lazy initialization of the OpenAI client (None when it cannot be created)"""
+        if self._client is None and self.api_key and OPENAI_AVAILABLE:
             try:
-                # Instantiate the official OpenAI client
-                # Use the correct API for the installed version
-                self.client = OpenAI(api_key=self.api_key)
+                # Instantiate the official async OpenAI client over an HTTP/2 pool so concurrent
+                # completions multiplex on warm connections. Retries are handled by _retry_with_backoff.
+                http_client = httpx.AsyncClient(
+                    http2=True,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0),
+                )
+                self._client = AsyncOpenAI(api_key=self.api_key, max_retries=0, http_client=http_client)
                 logger.info("✅ OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize OpenAI client: {e}")
-                # Keep client as None; methods will raise if used.
-                self.client = None
+        return self._client
 
     @property
     def db(self):
@@ -688,44 +801,76 @@ class ChatGPTService:
             self._db = get_firestore_client()
         return self._db
 
-    def _check_rate_limit(self) -> None:
-        """Check and enforce rate limiting for OpenAI API calls"""
-        import time
+    def start_warmup(self) -> None:
+        """Warm up in the background so application startup never waits on the OpenAI API"""
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self.warmup())
 
-        current_time = time.time()
-
-        # Reset counter if a minute has passed
-        if current_time - self._last_request_time >= 60:
-            self._request_count = 0
-            self._last_request_time = current_time
-
-        # Check if we're over the rate limit
-        if self._request_count >= self.rate_limit_per_minute:
-            sleep_time = 60 - (current_time - self._last_request_time)
-            if sleep_time > 0:
-                logger.warning(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                self._request_count = 0
-                self._last_request_time = time.time()
-
-        self._request_count += 1
+    async def warmup(self) -> None:
+        """
+        Open a pooled connection to the OpenAI API at application startup so
+        the first completion does not pay the TCP/TLS handshake.
+        """
+        if self._mock_only:
+            return
+        try:
+            await self.client.models.list(timeout=_WARMUP_TIMEOUT_SECONDS)
+            logger.info("ChatGPT service warmup complete")
+        except Exception as e:
+            logger.warning(f"ChatGPT service warmup failed: {e}")
+
+    async def aclose(self) -> None:
+        """Close the OpenAI client and its HTTP/2 connection pool (called on application shutdown)"""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a deterministic request; None when the response must not be cached"""
+        if self._response_cache is None or kwargs.get("temperature") != 0:
+            return None
+        material = {k: kwargs.get(k) for k in ("model", "messages", "temperature", "max_tokens")}
+        return hashlib.sha256(orjson.dumps(material, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
     async def _make_openai_request(self, **kwargs):
         """
         Make asynchronous OpenAI API request.
-        The OpenAI SDK client's `chat.completions.create` is blocking, so run it in a thread.
+        Deterministic (temperature 0) requests are answered from the response cache when possible,
+        and identical ones already in flight share a single upstream call.
         """
-        import time
-
         if not self.client:
             raise ValueError("OpenAI client not initialized. Check API key and package installation.")
 
+        cache_key = self._cache_key(kwargs)
+        if cache_key is None:
+            return await self._send_openai_request(None, kwargs)
+
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("OpenAI API response served from cache")
+            return cached
+
+        pending = self._inflight_requests.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._send_openai_request(cache_key, kwargs))
+            self._inflight_requests[cache_key] = pending
+            pending.add_done_callback(lambda _f, key=cache_key: self._inflight_requests.pop(key, None))
+        # Shielded so one cancelled caller does not abort the request for the others
+        return await asyncio.shield(pending)
+
+    async def _send_openai_request(self, cache_key: Optional[str], kwargs: Dict[str, Any]):
+        # Only upstream calls spend rate limit tokens; cache hits and coalesced waiters do not
+        await self._rate_limiter.acquire()
         start_time = time.time()
         try:
-            # Run the blocking call in a thread so it is awaitable
-            response = await asyncio.to_thread(self.client.chat.completions.create, **kwargs)
+            response = await self.client.chat.completions.create(**kwargs)
             elapsed = time.time() - start_time
             logger.info(f"OpenAI API request completed in {elapsed:.2f}s")
+            if cache_key is not None:
+                self._response_cache[cache_key] = response
             return response
         except Exception as e:
             elapsed = time.time() - start_time
@@ -746,9 +891,9 @@ class ChatGPTService:
                     logger.error(f"All retry attempts failed. Final error: {e}")
                     raise
 
-                # Try to detect retryable errors (rate limit / server)
-                status = getattr(e, "status", None)
-                if status in (429, 500, 502, 503, 504) or isinstance(e, (TimeoutError,)):
+                # Retryable: rate limits, 5xx (APIStatusError.status_code), timeouts and connection errors
+                status = getattr(e, "status_code", None)
+                if status in _RETRYABLE_STATUS or isinstance(e, _RETRYABLE_ERRORS):
                     wait_time = (2 ** attempt) + random.uniform(0, 1)
                     logger.warning(
                         f"Retryable error on attempt {attempt + 1}/{self.max_retries}: {e}. Retrying in {wait_time:.2f}s"
@@ -768,31 +913,26 @@ class ChatGPTService:
         profile_data: Dict[str, Any],
         chart_data: Dict[str, Any],
         prediction_type: str = "daily",
+        chart_json: Optional[str] = None,
     ) -> str:
         """
         Generate personalized astrology predictions using ChatGPT
-        """
-        try:
-            if not self.client:
-                raise ValueError("OpenAI client not initialized. Check API key configuration.")
 
-            prompt = self._create_prediction_prompt(profile_data, chart_data, prediction_type)
+        chart_json may carry chart_data already serialized, so callers generating several
+        prediction types for one chart only serialize it once.
+        """
+        if self._mock_only:
+            return self._generate_mock_prediction(profile_data, prediction_type)
 
-            # Rate limiting
-            self._check_rate_limit()
+        try:
+            prompt = self._create_prediction_prompt(profile_data, chart_data, prediction_type, chart_json)
 
             response = await self._retry_with_backoff(
                 self._make_openai_request,
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Vedic astrologer with deep knowledge of astrology, zodiac signs, and planetary influences. Provide accurate, personalized predictions based on birth chart data.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=self._prediction_messages(prompt),
                 temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                max_tokens=self._prediction_max_tokens(prediction_type),
                 timeout=self.timeout,
             )
 
@@ -815,6 +955,126 @@ class ChatGPTService:
             logger.info("🔄 Using fallback prediction generation")
             return self._generate_mock_prediction(profile_data, prediction_type)
 
+    async def stream_personal_predictions(
+        self,
+        profile_data: Dict[str, Any],
+        chart_data: Dict[str, Any],
+        prediction_type: str = "daily",
+    ) -> AsyncIterator[str]:
+        """
+        Stream a personalized astrology prediction as text deltas
+
+        Falls back to the mock prediction (as a single chunk) when OpenAI is unavailable
+        or fails before any text arrives. A failure after text has been yielded is
+        re-raised so the caller can discard the partial prediction.
+        Closing the iterator early (e.g. client disconnect) closes the upstream stream.
+        """
+        if self._mock_only:
+            yield self._generate_mock_prediction(profile_data, prediction_type)
+            return
+
+        prompt = self._create_prediction_prompt(profile_data, chart_data, prediction_type)
+
+        try:
+            await self._rate_limiter.acquire()
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._prediction_messages(prompt),
+                temperature=self.temperature,
+                max_tokens=self._prediction_max_tokens(prediction_type),
+                timeout=self.timeout,
+                stream=True,
+            )
+        except Exception as e:
+            logger.error(f"Failed to start prediction stream: {e}")
+            logger.info("🔄 Using fallback prediction generation")
+            yield self._generate_mock_prediction(profile_data, prediction_type)
+            return
+
+        streamed = False
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        streamed = True
+                        yield delta
+        except Exception as e:
+            if streamed:
+                logger.error(f"Prediction stream failed mid-response: {e}")
+                raise
+            logger.error(f"Prediction stream failed before any output: {e}")
+            logger.info("🔄 Using fallback prediction generation")
+            yield self._generate_mock_prediction(profile_data, prediction_type)
+        finally:
+            await stream.close()
+
+    async def generate_personal_predictions_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], str]],
+    ) -> List[str]:
+        """
+        Generate several personalized predictions concurrently
+
+        Args:
+            items: (profile_data, chart_data, prediction_type) tuples
+
+        Returns:
+            Prediction texts in the same order as items
+        """
+        slots = self._get_batch_slots()
+        chart_dumps = self._chart_dumps(items) if not self._mock_only else {}
+
+        async def _one(profile_data: Dict[str, Any], chart_data: Dict[str, Any], prediction_type: str) -> str:
+            async with slots:
+                return await self.generate_personal_predictions(
+                    profile_data, chart_data, prediction_type, chart_dumps.get(id(chart_data))
+                )
+
+        return list(await asyncio.gather(*(_one(*item) for item in items)))
+
+    async def generate_marriage_compatibility_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate several marriage compatibility analyses concurrently
+
+        Args:
+            items: (main_profile, partner_profile, main_chart, partner_chart) tuples
+
+        Returns:
+            Compatibility results in the same order as items
+        """
+        slots = self._get_batch_slots()
+
+        async def _one(
+            main_profile: Dict[str, Any],
+            partner_profile: Dict[str, Any],
+            main_chart: Dict[str, Any],
+            partner_chart: Dict[str, Any],
+        ) -> Dict[str, Any]:
+            async with slots:
+                return await self.generate_marriage_compatibility(main_profile, partner_profile, main_chart, partner_chart)
+
+        return list(await asyncio.gather(*(_one(*item) for item in items)))
+
+    @staticmethod
+    def _chart_dumps(items: List[Tuple[Any, ...]]) -> Dict[int, str]:
+        """Serialize each distinct chart in a batch once, keyed by id() (items keep them alive)"""
+        dumps: Dict[int, str] = {}
+        for item in items:
+            chart_data = item[-2]
+            if id(chart_data) not in dumps:
+                dumps[id(chart_data)] = _dump_chart(chart_data)
+        return dumps
+
+    def _get_batch_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding batch fan-out, created lazily inside the running loop"""
+        if self._batch_slots is None:
+            self._batch_slots = asyncio.Semaphore(max(getattr(settings, "openai_max_concurrency", 20), 1))
+        return self._batch_slots
+
     async def generate_marriage_compatibility(
         self,
         main_profile: Dict[str, Any],
@@ -825,46 +1085,12 @@ class ChatGPTService:
         """
         Generate marriage compatibility analysis using ChatGPT
         """
-        try:
-            if not self.client:
-                raise ValueError("OpenAI client not initialized. Check API key configuration.")
-
-            stored_prompt = self._get_marriage_compatibility_prompt()
+        if self._mock_only:
+            return self._generate_mock_compatibility(main_profile, partner_profile)
 
-            formatted_prompt = stored_prompt.replace("{MAIN_NAME}", main_profile.get("name", "User"))
-            formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_DATE}", str(main_profile.get("birth_date", "Unknown")))
-            formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_TIME}", str(main_profile.get("birth_time", "Unknown")))
-            formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_PLACE}", main_profile.get("birth_place", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{MAIN_ZODIAC_SIGN}", main_profile.get("zodiac_sign", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{MAIN_MOON_SIGN}", main_profile.get("moon_sign", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{MAIN_GENDER}", main_profile.get("gender", "Unknown"))
-
-            formatted_prompt = formatted_prompt.replace("{PARTNER_NAME}", partner_profile.get("name", "Partner"))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_DATE}", str(partner_profile.get("birth_date", "Unknown")))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_TIME}", str(partner_profile.get("birth_time", "Unknown")))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_PLACE}", partner_profile.get("birth_place", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_ZODIAC_SIGN}", partner_profile.get("zodiac_sign", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_MOON_SIGN}", partner_profile.get("moon_sign", "Unknown"))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_GENDER}", partner_profile.get("gender", "Unknown"))
-
-            def json_encoder(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, time):
-                    return obj.isoformat()
-                elif hasattr(obj, "dict"):
-                    return obj.dict()
-                elif hasattr(obj, "__dict__"):
-                    return obj.__dict__
-                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-            formatted_prompt = formatted_prompt.replace("{MAIN_CHART_DATA}", json.dumps(main_chart, indent=2, default=json_encoder))
-            formatted_prompt = formatted_prompt.replace("{PARTNER_CHART_DATA}", json.dumps(partner_chart, indent=2, default=json_encoder))
-
-            # Rate limiting
-            self._check_rate_limit()
+        try:
+            stored_prompt = await self._get_cached_marriage_prompt()
+            formatted_prompt = self._create_marriage_prompt(main_profile, partner_profile, main_chart, partner_chart, stored_prompt)
 
             response = await self._retry_with_backoff(
                 self._make_openai_request,
@@ -894,8 +1120,131 @@ class ChatGPTService:
             logger.info("🔄 Using fallback marriage compatibility analysis")
             return self._generate_mock_compatibility(main_profile, partner_profile)
 
-    def _create_prediction_prompt(self, profile_data: Dict[str, Any], chart_data: Dict[str, Any], prediction_type: str) -> str:
-        """Create prompt for astrology predictions"""
+    async def submit_batch_predictions(
+        self,
+        items: List[Tuple[str, Dict[str, Any], Dict[str, Any], str]],
+    ) -> str:
+        """
+        Submit predictions for offline generation through the OpenAI Batch API
+
+        Batch jobs are billed at a discount and drawn from a separate rate limit pool,
+        so bulk precomputation does not compete with interactive requests.
+
+        Args:
+            items: (custom_id, profile_data, chart_data, prediction_type) tuples;
+                custom_id must be unique and is used to match results
+
+        Returns:
+            The OpenAI batch id, to be passed to poll_batch
+        """
+        if self._mock_only:
+            raise ValueError("OpenAI client not initialized. Check API key configuration.")
+
+        chart_dumps = self._chart_dumps(items)
+        lines = []
+        for custom_id, profile_data, chart_data, prediction_type in items:
+            prompt = self._create_prediction_prompt(profile_data, chart_data, prediction_type, chart_dumps[id(chart_data)])
+            lines.append(orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._prediction_messages(prompt),
+                    "temperature": self.temperature,
+                    "max_tokens": self._prediction_max_tokens(prediction_type),
+                },
+            }))
+
+        input_file = await self.client.files.create(
+            file=("predictions.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(lines)} predictions")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str, max_wait: float = 0.0) -> Dict[str, Any]:
+        """
+        Check an OpenAI batch job and collect its results once completed
+
+        Args:
+            batch_id: Id returned by submit_batch_predictions
+            max_wait: Seconds to keep polling (with exponential backoff) for a terminal
+                status; 0 checks once
+
+        Returns:
+            {"status", "request_counts", "results": {custom_id: text}, "errors": {custom_id: message}}
+        """
+        if self._mock_only:
+            raise ValueError("OpenAI client not initialized. Check API key configuration.")
+
+        deadline = time.monotonic() + max_wait
+        delay = 5.0
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            remaining = deadline - time.monotonic()
+            if batch.status in _BATCH_TERMINAL_STATUSES or remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 300.0)
+
+        counts = batch.request_counts
+        outcome: Dict[str, Any] = {
+            "status": batch.status,
+            "request_counts": counts.model_dump() if counts is not None else None,
+            "results": {},
+            "errors": {},
+        }
+        if batch.status != "completed":
+            return outcome
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line:
+                    continue
+                record = orjson.loads(line)
+                custom_id = record.get("custom_id")
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    choices = response["body"].get("choices") or []
+                    text = (choices[0]["message"].get("content") or "") if choices else ""
+                    outcome["results"][custom_id] = text.strip()
+                else:
+                    error = record.get("error") or response.get("body", {}).get("error") or {}
+                    outcome["errors"][custom_id] = error.get("message") or str(error)
+
+        logger.info(
+            f"OpenAI batch {batch_id} completed: {len(outcome['results'])} results, {len(outcome['errors'])} errors"
+        )
+        return outcome
+
+    def _prediction_max_tokens(self, prediction_type: str) -> int:
+        return min(_PREDICTION_MAX_TOKENS.get(prediction_type, self.max_tokens), self.max_tokens)
+
+    def _prediction_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": _PREDICTION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _create_prediction_prompt(
+        self,
+        profile_data: Dict[str, Any],
+        chart_data: Dict[str, Any],
+        prediction_type: str,
+        chart_json: Optional[str] = None,
+    ) -> str:
+        """Create the per-user prompt for astrology predictions (instructions live in the system prompt)"""
+        if chart_json is None:
+            chart_json = _dump_chart(chart_data)
         birth_date = profile_data.get("birth_date", "Unknown")
         zodiac_sign = profile_data.get("zodiac_sign", "Unknown")
         moon_sign = profile_data.get("moon_sign", "Unknown")
@@ -911,49 +1260,44 @@ class ChatGPTService:
         - Gender: {profile_data.get('gender', 'Unknown')}
 
         Astrology Chart Data:
-        {json.dumps(chart_data, indent=2)}
-
-        Please provide a detailed, accurate {prediction_type} prediction covering:
-        1. Overall outlook for the day/week/month
-        2. Career and professional matters
-        3. Health and well-being
-        4. Relationships and personal life
-        5. Financial matters
-        6. Lucky numbers, colors, and directions
-        7. Any precautions or remedies
-
-        Make the prediction personal, positive, and actionable. Use traditional Vedic astrology principles.
+        {chart_json}
         """
 
         return prompt
 
-    def _create_marriage_prompt(self, main_profile: Dict[str, Any], partner_profile: Dict[str, Any], main_chart: Dict[str, Any], partner_chart: Dict[str, Any]) -> str:
+    def _create_marriage_prompt(
+        self,
+        main_profile: Dict[str, Any],
+        partner_profile: Dict[str, Any],
+        main_chart: Dict[str, Any],
+        partner_chart: Dict[str, Any],
+        stored_prompt: Optional[str] = None,
+    ) -> str:
         """Create prompt for marriage compatibility analysis using the stored Vedic astrology prompt"""
-        stored_prompt = self._get_marriage_compatibility_prompt()
-
-        formatted_prompt = stored_prompt.replace("{MAIN_NAME}", main_profile.get("name", "User"))
-        formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_DATE}", str(main_profile.get("birth_date", "Unknown")))
-        formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_TIME}", str(main_profile.get("birth_time", "Unknown")))
-        formatted_prompt = formatted_prompt.replace("{MAIN_BIRTH_PLACE}", main_profile.get("birth_place", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{MAIN_ZODIAC_SIGN}", main_profile.get("zodiac_sign", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{MAIN_MOON_SIGN}", main_profile.get("moon_sign", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{MAIN_GENDER}", main_profile.get("gender", "Unknown"))
-
-        formatted_prompt = formatted_prompt.replace("{PARTNER_NAME}", partner_profile.get("name", "Partner"))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_DATE}", str(partner_profile.get("birth_date", "Unknown")))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_TIME}", str(partner_profile.get("birth_time", "Unknown")))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_BIRTH_PLACE}", partner_profile.get("birth_place", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_ZODIAC_SIGN}", partner_profile.get("zodiac_sign", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_MOON_SIGN}", partner_profile.get("moon_sign", "Unknown"))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_GENDER}", partner_profile.get("gender", "Unknown"))
-
-        def json_encoder(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-        formatted_prompt = formatted_prompt.replace("{MAIN_CHART_DATA}", json.dumps(main_chart, indent=2, default=json_encoder))
-        formatted_prompt = formatted_prompt.replace("{PARTNER_CHART_DATA}", json.dumps(partner_chart, indent=2, default=json_encoder))
+        if stored_prompt is None:
+            stored_prompt = self._get_marriage_compatibility_prompt()
+
+        fields = {
+            "MAIN_NAME": main_profile.get("name", "User"),
+            "MAIN_BIRTH_DATE": str(main_profile.get("birth_date", "Unknown")),
+            "MAIN_BIRTH_TIME": str(main_profile.get("birth_time", "Unknown")),
+            "MAIN_BIRTH_PLACE": main_profile.get("birth_place", "Unknown"),
+            "MAIN_ZODIAC_SIGN": main_profile.get("zodiac_sign", "Unknown"),
+            "MAIN_MOON_SIGN": main_profile.get("moon_sign", "Unknown"),
+            "MAIN_GENDER": main_profile.get("gender", "Unknown"),
+            "PARTNER_NAME": partner_profile.get("name", "Partner"),
+            "PARTNER_BIRTH_DATE": str(partner_profile.get("birth_date", "Unknown")),
+            "PARTNER_BIRTH_TIME": str(partner_profile.get("birth_time", "Unknown")),
+            "PARTNER_BIRTH_PLACE": partner_profile.get("birth_place", "Unknown"),
+            "PARTNER_ZODIAC_SIGN": partner_profile.get("zodiac_sign", "Unknown"),
+            "PARTNER_MOON_SIGN": partner_profile.get("moon_sign", "Unknown"),
+            "PARTNER_GENDER": partner_profile.get("gender", "Unknown"),
+            "MAIN_CHART_DATA": _dump_chart(main_chart),
+            "PARTNER_CHART_DATA": _dump_chart(partner_chart),
+        }
+
+        # One pass over the template; unknown {PLACEHOLDERS} and other braces are left as-is
+        formatted_prompt = _PLACEHOLDER_RE.sub(lambda m: str(fields.get(m.group(1), m.group(0))), stored_prompt)
 
         return formatted_prompt
 
@@ -989,7 +1333,6 @@ class ChatGPTService:
     def _parse_compatibility_analysis(self, analysis: str) -> Dict[str, Any]:
         """Parse ChatGPT response to extract structured compatibility data"""
         # simplified parser
-        lines = analysis.split("\n")
         compatibility_data = {
             "overall_score": 75.0,
             "guna_score": 25,
@@ -1000,41 +1343,50 @@ class ChatGPTService:
             "ai_insights": analysis,
         }
 
-        for line in lines:
-            low = line.lower()
-            if "compatibility" in low and ("score" in low or "percentage" in low):
-                words = line.replace("%", "").split()
-                for word in words:
-                    if word.replace(".", "").isdigit():
-                        try:
-                            score = float(word)
-                            if 0 <= score <= 100:
-                                compatibility_data["overall_score"] = score
-                        except ValueError:
-                            pass
-
-            if "guna" in low and "score" in low:
-                words = line.split()
-                for word in words:
-                    if word.isdigit():
-                        try:
-                            guna_score = int(word)
-                            if 0 <= guna_score <= 36:
-                                compatibility_data["guna_score"] = guna_score
-                        except ValueError:
-                            pass
-
-        if compatibility_data["overall_score"] >= 85:
-            compatibility_data["compatibility_level"] = "excellent"
-        elif compatibility_data["overall_score"] >= 70:
-            compatibility_data["compatibility_level"] = "good"
-        elif compatibility_data["overall_score"] >= 50:
-            compatibility_data["compatibility_level"] = "average"
-        else:
-            compatibility_data["compatibility_level"] = "poor"
+        # Last in-range value on a matching line wins, e.g. "Compatibility score (out of 100): 82"
+        for line in _SCORE_LINE_RE.finditer(analysis):
+            for match in _SCORE_VALUE_RE.finditer(line.group()):
+                score = float(match.group(1))
+                if 0 <= score <= 100:
+                    compatibility_data["overall_score"] = score
+
+        for line in _GUNA_LINE_RE.finditer(analysis):
+            for match in _GUNA_VALUE_RE.finditer(line.group()):
+                guna_score = int(match.group(1))
+                if 0 <= guna_score <= 36:
+                    compatibility_data["guna_score"] = guna_score
+
+        compatibility_data["compatibility_level"] = next(
+            level for threshold, level in _COMPATIBILITY_LEVELS if compatibility_data["overall_score"] >= threshold
+        )
 
         return compatibility_data
 
+    async def _get_cached_marriage_prompt(self) -> str:
+        """
+        Marriage compatibility prompt served from memory.
+
+        Only the first calls wait on Firestore, sharing a single read; once the TTL lapses
+        the cached prompt keeps being served while a single background task reloads it.
+        """
+        cached = self._marriage_prompt
+        if cached is None:
+            if self._marriage_prompt_refresh is None or self._marriage_prompt_refresh.done():
+                self._marriage_prompt_refresh = asyncio.create_task(self._refresh_marriage_prompt())
+            await asyncio.shield(self._marriage_prompt_refresh)
+            return self._marriage_prompt[1]
+
+        loaded_at, prompt = cached
+        if time.monotonic() - loaded_at >= _PROMPT_CACHE_TTL_SECONDS and (
+            self._marriage_prompt_refresh is None or self._marriage_prompt_refresh.done()
+        ):
+            self._marriage_prompt_refresh = asyncio.create_task(self._refresh_marriage_prompt())
+        return prompt
+
+    async def _refresh_marriage_prompt(self) -> None:
+        prompt = await asyncio.to_thread(self._get_marriage_compatibility_prompt)
+        self._marriage_prompt = (time.monotonic(), prompt)
+
     def _get_marriage_compatibility_prompt(self) -> str:
         """Get the stored marriage compatibility prompt from database (sync)"""
         try:
@@ -1046,11 +1398,12 @@ class ChatGPTService:
                 return data.get("prompt", self._get_default_marriage_prompt())
             else:
                 default_prompt = self._get_default_marriage_prompt()
+                now = datetime.now(timezone.utc).isoformat()
                 prompt_ref.set(
                     {
                         "prompt": default_prompt,
-                        "created_at": datetime.utcnow().isoformat(),
-                        "updated_at": datetime.utcnow().isoformat(),
+                        "created_at": now,
+                        "updated_at": now,
                         "version": "1.0",
                     }
                 )
@@ -1063,18 +1416,16 @@ class ChatGPTService:
 
     def _get_default_marriage_prompt(self) -> str:
         """Get the default marriage compatibility prompt"""
-        return """
-You are Zodira – a Vedic Astrology AI specialized in marriage compatibility analysis.
-Your task is to generate a complete marriage matching report for the given bride and groom data.
-
-... (omitted here for brevity; keep the same default prompt as in your original file) ...
-"""
+        return _DEFAULT_MARRIAGE_PROMPT
 
     async def save_marriage_compatibility_prompt(self, prompt: str) -> bool:
         """Save or update the marriage compatibility prompt in database"""
         try:
             prompt_ref = self.db.collection("ai_prompts").document("marriage_compatibility")
-            prompt_ref.set({"prompt": prompt, "updated_at": datetime.utcnow().isoformat(), "version": "1.1"})
+            await asyncio.to_thread(
+                prompt_ref.set, {"prompt": prompt, "updated_at": datetime.now(timezone.utc).isoformat(), "version": "1.1"}
+            )
+            self._marriage_prompt = (time.monotonic(), prompt)
             logger.info("Updated marriage compatibility prompt in database")
             return True
         except Exception as e:
@@ -1085,7 +1436,7 @@ Your task is to generate a complete marriage matching report for the given bride
         """Get the current marriage compatibility prompt from database"""
         try:
             prompt_ref = self.db.collection("ai_prompts").document("marriage_compatibility")
-            prompt_doc = prompt_ref.get()
+            prompt_doc = await asyncio.to_thread(prompt_ref.get)
             if prompt_doc.exists:
                 data = prompt_doc.to_dict()
                 return data.get("prompt")
@@ -13,7 +13,6 @@ This service provides comprehensive astrology functionality including:
 import os
 import json
 import logging
-import httpx
 from datetime import datetime, date, time
 from typing import Dict, List, Optional, Any
 from dateutil.relativedelta import relativedelta
@@ -28,9 +27,38 @@ from app.models.profile import (
 )
 from app.services.chatgpt_service import chatgpt_service
 from app.utils.astrology_utils import calculate_coordinates
+from app.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+
+def _convert_datetime(obj: Any) -> Any:
+    """Recursively replace datetime/date/time values with ISO strings"""
+    fn = _CONVERTERS.get(type(obj))
+    if fn is not None:
+        return fn(obj)
+    # Subclasses (e.g. Firestore's DatetimeWithNanoseconds) and plain objects
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if hasattr(obj, '__dict__'):
+        return _convert_datetime(obj.__dict__)
+    return obj
+
+
+# Exact-type dispatch for the common node types, checked before any isinstance fallback
+_CONVERTERS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    time: time.isoformat,
+    list: lambda items: [_convert_datetime(item) for item in items],
+    dict: lambda mapping: {key: _convert_datetime(value) for key, value in mapping.items()},
+    str: lambda value: value,
+    int: lambda value: value,
+    float: lambda value: value,
+    bool: lambda value: value,
+    type(None): lambda value: value,
+}
+
 class EnhancedAstrologyService:
     """Enhanced service for astrology calculations and AI predictions"""
 
@@ -237,23 +265,7 @@ class EnhancedAstrologyService:
                     chart_dict = chart.__dict__
 
                 # Handle datetime serialization
-                def convert_datetime(obj):
-                    if isinstance(obj, datetime):
-                        return obj.isoformat()
-                    elif isinstance(obj, date):
-                        return obj.isoformat()
-                    elif isinstance(obj, time):
-                        return obj.isoformat()
-                    elif hasattr(obj, '__dict__'):
-                        return convert_datetime(obj.__dict__)
-                    elif isinstance(obj, list):
-                        return [convert_datetime(item) for item in obj]
-                    elif isinstance(obj, dict):
-                        return {key: convert_datetime(value) for key, value in obj.items()}
-                    else:
-                        return obj
-
-                return convert_datetime(chart_dict)
+                return _convert_datetime(chart_dict)
             except Exception as e:
                 logger.error(f"Failed to convert chart to dict: {e}")
                 # Return basic structure as fallback
@@ -301,12 +313,12 @@ class EnhancedAstrologyService:
                 PredictionType.HEALTH
             ]
 
-            for pred_type in prediction_types:
-                # Generate prediction using ChatGPT
-                prediction_text = await chatgpt_service.generate_personal_predictions(
-                    profile_data, chart_data, pred_type.value
-                )
+            # Generate all prediction types concurrently using ChatGPT
+            prediction_texts = await chatgpt_service.generate_personal_predictions_batch(
+                [(profile_data, chart_data, pred_type.value) for pred_type in prediction_types]
+            )
 
+            for pred_type, prediction_text in zip(prediction_types, prediction_texts):
                 # Calculate expiration date
                 expires_at = None
                 if pred_type == PredictionType.DAILY:
@@ -821,47 +833,47 @@ class EnhancedAstrologyService:
 
             for config in api_configs:
                 try:
-                    async with httpx.AsyncClient(timeout=15.0) as client:
-                        logger.info(f"🔮 Calling astrology API: {config['url']}")
+                    client = get_http_client()
+                    logger.info(f"🔮 Calling astrology API: {config['url']}")
     
-                        # Support single or multiple payload variants
-                        payload_candidates = []
-                        if "payloads" in config:
-                            payload_candidates = config["payloads"]
-                        else:
-                            payload_candidates = [config.get("payload", {})]
-    
-                        for candidate in payload_candidates:
-                            # Remove None values from candidate payload
-                            payload = {k: v for k, v in candidate.items() if v is not None}
-                            try:
-                                keys = sorted(list(payload.keys()))
-                            except Exception:
-                                keys = list(payload.keys())
-                            logger.info(f"🔧 Payload keys for {config['url']}: {keys}")
+                    # Support single or multiple payload variants
+                    payload_candidates = []
+                    if "payloads" in config:
+                        payload_candidates = config["payloads"]
+                    else:
+                        payload_candidates = [config.get("payload", {})]
     
-                            response = await client.post(config["url"], json=payload, headers=config["headers"])
+                    for candidate in payload_candidates:
+                        # Remove None values from candidate payload
+                        payload = {k: v for k, v in candidate.items() if v is not None}
+                        try:
+                            keys = sorted(list(payload.keys()))
+                        except Exception:
+                            keys = list(payload.keys())
+                        logger.info(f"🔧 Payload keys for {config['url']}: {keys}")
     
-                            if response.status_code == 200:
-                                data = response.json()
-                                logger.info("✅ Astrology API call successful")
-                                return data
-                            if response.status_code == 400:
-                                logger.warning(f"⚠️ API bad request 400: {response.text}")
-                                # try next variant (if any)
-                                continue
-                            if response.status_code == 404:
-                                logger.warning(f"⚠️ API endpoint not found: {config['url']}")
-                                # No point trying more variants for this URL
-                                break
-                            if response.status_code == 403:
-                                logger.warning(f"⚠️ API access forbidden: {config['url']}")
-                                # Auth style likely wrong or key invalid; move on to next config
-                                break
+                        response = await client.post(config["url"], json=payload, headers=config["headers"], timeout=15.0)
     
-                            logger.warning(f"⚠️ API error {response.status_code}: {response.text}")
-                            # Unknown error for this URL; move on to next config
+                        if response.status_code == 200:
+                            data = response.json()
+                            logger.info("✅ Astrology API call successful")
+                            return data
+                        if response.status_code == 400:
+                            logger.warning(f"⚠️ API bad request 400: {response.text}")
+                            # try next variant (if any)
+                            continue
+                        if response.status_code == 404:
+                            logger.warning(f"⚠️ API endpoint not found: {config['url']}")
+                            # No point trying more variants for this URL
                             break
+                        if response.status_code == 403:
+                            logger.warning(f"⚠️ API access forbidden: {config['url']}")
+                            # Auth style likely wrong or key invalid; move on to next config
+                            break
+    
+                        logger.warning(f"⚠️ API error {response.status_code}: {response.text}")
+                        # Unknown error for this URL; move on to next config
+                        break
     
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to call {config['url']}: {e}")
@@ -17,7 +17,6 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple, Union, List
 from enum import Enum
 
-import httpx
 from firebase_admin import auth
 from google.oauth2 import id_token
 from google.auth.transport import requests
@@ -26,6 +25,7 @@ from google.cloud.firestore import FieldFilter
 from app.config.settings import settings
 from app.config.firebase import get_firestore_client
 from app.services.firebase_email_service import firebase_email_service
+from app.utils.http_client import get_http_client
 from app.core.security import (
     generate_secure_otp,
     create_access_token,
@@ -354,22 +354,22 @@ class UserService:
             
             # Try to send via API
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    logger.info(f"🔍 DEBUG: Making HTTP request to SMS API")
-                    response = await client.get(settings.mydreams_api_url, params=params)
-                    
-                    logger.info(f"🔍 DEBUG: SMS API Response Status: {response.status_code}")
-                    logger.info(f"🔍 DEBUG: SMS API Response Text: {response.text}")
-                    
-                    if response.status_code == 200:
-                        result = response.text.strip()
-                        if 'success' in result.lower() or 'sent' in result.lower():
-                            logger.info(f"✅ SMS OTP sent successfully to {phone}")
-                        else:
-                            logger.warning(f"⚠️ SMS API returned unexpected response: {result}")
+                client = get_http_client()
+                logger.info(f"🔍 DEBUG: Making HTTP request to SMS API")
+                response = await client.get(settings.mydreams_api_url, params=params)
+                
+                logger.info(f"🔍 DEBUG: SMS API Response Status: {response.status_code}")
+                logger.info(f"🔍 DEBUG: SMS API Response Text: {response.text}")
+                
+                if response.status_code == 200:
+                    result = response.text.strip()
+                    if 'success' in result.lower() or 'sent' in result.lower():
+                        logger.info(f"✅ SMS OTP sent successfully to {phone}")
                     else:
-                        logger.warning(f"⚠️ SMS API HTTP error: {response.status_code}")
-                        
+                        logger.warning(f"⚠️ SMS API returned unexpected response: {result}")
+                else:
+                    logger.warning(f"⚠️ SMS API HTTP error: {response.status_code}")
+                    
             except Exception as api_error:
                 logger.warning(f"⚠️ SMS API call failed: {api_error}")
             
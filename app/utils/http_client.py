@@ -0,0 +1,34 @@
+"""
+Shared outbound HTTP client.
+
+A single pooled httpx.AsyncClient for the whole process, so every service
+reuses warm connections (and HTTP/2 streams) instead of opening a new
+client and TLS handshake per call. Per-provider headers and timeouts are
+passed on each request.
+"""
+
+from typing import Optional
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide client, created lazily inside the running event loop"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+            http2=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,4 @@
+import os
+
+# Keep the suite off the OpenAI API: the ChatGPT service answers with its mock generators
+os.environ.setdefault("USE_MOCK_LLM", "True")
@@ -0,0 +1,244 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.astrology_service import (
+    AstrologyService,
+    _DEFAULT_VIMSHOTTARI_ORDER,
+    _JOB_STALE_SECONDS,
+    _add_years_months,
+    _backoff_delay,
+    _is_stale_job,
+    _nest_field_paths,
+    astrology_service,
+)
+
+BIRTH_DETAILS = {
+    "year": 1990,
+    "month": 5,
+    "date": 17,
+    "hours": 14,
+    "minutes": 30,
+    "seconds": 0,
+    "latitude": 12.9716,
+    "longitude": 77.5946,
+    "timezone": 5.5,
+}
+
+
+# Calendar arithmetic (replacement for relativedelta)
+
+@pytest.mark.parametrize("start, years, months, expected", [
+    (datetime(2000, 1, 15), 1, 0, datetime(2001, 1, 15)),
+    (datetime(2000, 1, 31), 0, 1, datetime(2000, 2, 29)),
+    (datetime(2001, 1, 31), 0, 1, datetime(2001, 2, 28)),
+    (datetime(2020, 2, 29), 1, 0, datetime(2021, 2, 28)),
+    (datetime(2000, 11, 15, 8, 30), 0, 3, datetime(2001, 2, 15, 8, 30)),
+    (datetime(2000, 6, 1), 7, 11, datetime(2008, 5, 1)),
+])
+def test_add_years_months(start, years, months, expected):
+    assert _add_years_months(start, years, months) == expected
+
+
+# Vimshottari Dasha
+
+@pytest.fixture
+def default_order(monkeypatch):
+    monkeypatch.setattr(AstrologyService, "_vimshottari_order", _DEFAULT_VIMSHOTTARI_ORDER)
+
+
+@pytest.mark.parametrize("moon_longitude, lord, first_end_age", [
+    (0.0, "Ketu", 7.0),
+    (40.0 / 3.0, "Venus", 20.0),          # exact start of the 2nd nakshatra
+    (2 * 40.0 / 3.0, "Sun", 6.0),
+    (20.0, "Venus", 10.0),                # halfway through Bharani
+    (359.99, "Mercury", 0.0),             # end of Revati, almost nothing left
+])
+def test_dasha_first_period_follows_nakshatra(default_order, moon_longitude, lord, first_end_age):
+    periods = astrology_service._compute_vimshottari_dasha(datetime(2000, 1, 1), moon_longitude)
+    assert periods[0].planet == lord
+    assert periods[0].start_age == 0.0
+    assert periods[0].end_age == pytest.approx(first_end_age, abs=0.1)
+
+
+@pytest.mark.parametrize("moon_longitude", [0.0, 13.3, 40.0 / 3.0, 123.4, 359.99])
+def test_dasha_sequence_is_contiguous_and_reaches_120_years(default_order, moon_longitude):
+    periods = astrology_service._compute_vimshottari_dasha(datetime(1990, 5, 17, 14, 30), moon_longitude)
+
+    for previous, current in zip(periods, periods[1:]):
+        assert current.start_date == previous.end_date
+        assert current.start_age == previous.end_age
+
+    order = [lord for lord, _ in _DEFAULT_VIMSHOTTARI_ORDER]
+    first = order.index(periods[0].planet)
+    assert [p.planet for p in periods] == [order[(first + i) % len(order)] for i in range(len(periods))]
+
+    # Stops at the first period ending past 120 years (ages are rounded to 2 places)
+    assert periods[-1].end_age >= 120
+    assert periods[-2].end_age <= 120
+
+
+def test_dasha_missing_moon_longitude_uses_zero(default_order):
+    periods = astrology_service._compute_vimshottari_dasha(datetime(2000, 1, 1), None)
+    assert periods[0].planet == "Ketu"
+
+
+# Disk cache key
+
+def test_cache_file_equal_for_equal_birth_details():
+    assert astrology_service._cache_file("rasi", BIRTH_DETAILS) == astrology_service._cache_file("rasi", dict(BIRTH_DETAILS))
+
+
+@pytest.mark.parametrize("field, value", [
+    ("year", 1991),
+    ("month", 6),
+    ("date", 18),
+    ("hours", 15),
+    ("minutes", 31),
+    ("seconds", 1),
+    ("latitude", 13.0),
+    ("longitude", 77.6),
+    ("timezone", 5.0),
+])
+def test_cache_file_changes_with_any_birth_detail(field, value):
+    changed = {**BIRTH_DETAILS, field: value}
+    assert astrology_service._cache_file("rasi", changed) != astrology_service._cache_file("rasi", BIRTH_DETAILS)
+
+
+def test_cache_file_is_per_chart_type():
+    assert astrology_service._cache_file("rasi", BIRTH_DETAILS) != astrology_service._cache_file("navamsa", BIRTH_DETAILS)
+
+
+# Upstream retry backoff
+
+def test_backoff_delay_never_undercuts_retry_after():
+    for attempt in range(4):
+        for _ in range(200):
+            assert _backoff_delay(attempt, floor=10.0) >= 10.0
+
+
+def test_backoff_delay_is_jittered_exponential():
+    for attempt in range(4):
+        delay = _backoff_delay(attempt)
+        assert 0.8 * 2 ** attempt <= delay <= 1.2 * 2 ** attempt
+    assert _backoff_delay(10) <= 72.0
+
+
+# Firestore field paths
+
+def test_nest_field_paths():
+    payload = {
+        "chart_parts.rasi": {"1": "Aries"},
+        "chart_parts.navamsa": {},
+        "meta.source.name": "api",
+        "updated_at": "now",
+    }
+    assert _nest_field_paths(payload) == {
+        "chart_parts": {"rasi": {"1": "Aries"}, "navamsa": {}},
+        "meta": {"source": {"name": "api"}},
+        "updated_at": "now",
+    }
+
+
+def test_nest_field_paths_without_dots_is_unchanged():
+    assert _nest_field_paths({"a": 1, "b": {"c": 2}}) == {"a": 1, "b": {"c": 2}}
+
+
+# Background generation jobs
+
+def test_is_stale_job():
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    old = now - timedelta(seconds=_JOB_STALE_SECONDS + 1)
+    recent = now - timedelta(seconds=10)
+    assert _is_stale_job({"status": "processing", "updated_at": old}, now)
+    assert _is_stale_job({"status": "queued", "updated_at": old.replace(tzinfo=None)}, now)
+    assert not _is_stale_job({"status": "processing", "updated_at": recent}, now)
+    assert not _is_stale_job({"status": "completed", "updated_at": old}, now)
+    assert not _is_stale_job({"status": "queued"}, now)
+
+
+@pytest.fixture
+def job_service(monkeypatch):
+    service = AstrologyService()
+    statuses = []
+    release = asyncio.Event()
+    generated = []
+
+    async def fake_set_job_status(job_id, user_id, profile_id, status, error=None):
+        statuses.append((job_id, status, error))
+
+    async def fake_generate(user_id, profile_id, birth_details):
+        generated.append((user_id, profile_id))
+        await release.wait()
+
+    monkeypatch.setattr(service, "_set_job_status", fake_set_job_status)
+    monkeypatch.setattr(service, "generate_astrology_chart", fake_generate)
+    return service, statuses, generated, release
+
+
+@pytest.mark.asyncio
+async def test_concurrent_enqueues_share_one_job(job_service):
+    service, statuses, generated, release = job_service
+
+    job_ids = await asyncio.gather(*(service.enqueue_chart_generation("u1", "p1", BIRTH_DETAILS) for _ in range(5)))
+    assert set(job_ids) == {"u1_p1"}
+    assert len(service._generation_jobs) == 1
+
+    release.set()
+    await asyncio.gather(*service._generation_jobs.values())
+
+    assert generated == [("u1", "p1")]
+    assert [status for _, status, _ in statuses] == ["queued", "processing", "completed"]
+    assert service._generation_jobs == {}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_records_queued_before_returning(job_service):
+    service, statuses, generated, release = job_service
+
+    await service.enqueue_chart_generation("u1", "p1", BIRTH_DETAILS)
+    assert statuses[0] == ("u1_p1", "queued", None)
+
+    release.set()
+    await asyncio.gather(*service._generation_jobs.values())
+
+
+@pytest.mark.asyncio
+async def test_get_generation_job_reports_live_state(job_service):
+    service, statuses, generated, release = job_service
+
+    await service.enqueue_chart_generation("u1", "p1", BIRTH_DETAILS)
+    while not generated:
+        await asyncio.sleep(0)
+    job = await service.get_generation_job("u1", "p1")
+    assert job["status"] == "processing"
+
+    release.set()
+    await asyncio.gather(*service._generation_jobs.values())
+    assert service._job_states == {}
+
+
+@pytest.mark.asyncio
+async def test_aclose_records_cancelled_jobs_as_failed(job_service):
+    service, statuses, generated, release = job_service
+
+    await service.enqueue_chart_generation("u1", "p1", BIRTH_DETAILS)
+    await asyncio.sleep(0)
+    await service.aclose()
+
+    assert statuses[-1] == ("u1_p1", "failed", "cancelled")
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_recorded(job_service, monkeypatch):
+    service, statuses, generated, release = job_service
+
+    async def boom(user_id, profile_id, birth_details):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(service, "generate_astrology_chart", boom)
+    await service.enqueue_chart_generation("u1", "p1", BIRTH_DETAILS)
+    await asyncio.gather(*service._generation_jobs.values())
+
+    assert statuses[-1] == ("u1_p1", "failed", "upstream down")
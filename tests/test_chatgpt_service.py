@@ -0,0 +1,109 @@
+import pytest
+
+from app.services.chatgpt_service import chatgpt_service
+
+
+def parse(analysis):
+    return chatgpt_service._parse_compatibility_analysis(analysis)
+
+
+@pytest.mark.parametrize("analysis, expected", [
+    ("Compatibility score (out of 100): 82", 82.0),
+    ("Compatibility percentage for 2 charts is 64", 64.0),
+    ("Overall score for compatibility: 78 %", 78.0),
+    ("Compatibility Score: 91%", 91.0),
+    ("Compatibility score: 150", 75.0),  # out of range, default kept
+    ("No score mentioned", 75.0),
+])
+def test_parse_overall_score(analysis, expected):
+    assert parse(analysis)["overall_score"] == expected
+
+
+@pytest.mark.parametrize("analysis, expected", [
+    ("Total Guna score out of 36: 28", 28),
+    ("Guna Milan score: 30", 30),
+    ("Guna score: 40", 25),  # out of range, default kept
+])
+def test_parse_guna_score(analysis, expected):
+    assert parse(analysis)["guna_score"] == expected
+
+
+def test_parse_uses_last_matching_line():
+    analysis = "Compatibility score: 60\nSome other line 99\nFinal compatibility score: 88"
+    assert parse(analysis)["overall_score"] == 88.0
+
+
+@pytest.mark.parametrize("score, level", [
+    (90, "excellent"),
+    (85, "excellent"),
+    (70, "good"),
+    (55, "average"),
+    (10, "poor"),
+])
+def test_parse_compatibility_level(score, level):
+    assert parse(f"Compatibility score: {score}")["compatibility_level"] == level
+
+
+def test_create_marriage_prompt_fills_placeholders():
+    prompt = chatgpt_service._create_marriage_prompt(
+        {"name": "Asha", "gender": "female", "birth_date": "1995-03-02"},
+        {"name": "Ravi"},
+        {"moon": "Taurus"},
+        {},
+        "Bride {MAIN_NAME} ({MAIN_GENDER}, {MAIN_BIRTH_DATE}) and groom {PARTNER_NAME} ({PARTNER_GENDER}).\n"
+        "{MAIN_CHART_DATA} {PARTNER_CHART_DATA} Keep {UNKNOWN_FIELD} and {lowercase}.",
+    )
+    assert prompt == (
+        "Bride Asha (female, 1995-03-02) and groom Ravi (Unknown).\n"
+        '{"moon":"Taurus"} {} Keep {UNKNOWN_FIELD} and {lowercase}.'
+    )
+
+
+def test_create_marriage_prompt_does_not_resubstitute_values():
+    prompt = chatgpt_service._create_marriage_prompt(
+        {"name": "{PARTNER_NAME}"}, {"name": "Ravi"}, {}, {}, "{MAIN_NAME} & {PARTNER_NAME}"
+    )
+    assert prompt == "{PARTNER_NAME} & Ravi"
+
+
+def _status_error(status_code):
+    import httpx
+    import openai
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.APIStatusError("upstream error", response=httpx.Response(status_code, request=request), body=None)
+
+
+@pytest.fixture
+def no_backoff_sleep(monkeypatch):
+    async def _sleep(_seconds):
+        return None
+
+    monkeypatch.setattr("app.services.chatgpt_service.asyncio.sleep", _sleep)
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff_retries_rate_limited_requests(no_backoff_sleep):
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _status_error(429)
+        return "ok"
+
+    assert await chatgpt_service._retry_with_backoff(flaky) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff_does_not_retry_client_errors(no_backoff_sleep):
+    calls = []
+
+    async def bad_request():
+        calls.append(1)
+        raise _status_error(400)
+
+    with pytest.raises(Exception):
+        await chatgpt_service._retry_with_backoff(bad_request)
+    assert len(calls) == 1